@@ -1,16 +1,21 @@
 """Configuration settings for the Finance AI Agent."""
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
+from functools import cache
+from typing import Any
+
+
+_ENV_CONFIG = SettingsConfigDict(
+    env_file=".env",
+    case_sensitive=False,
+    extra="ignore"
+)
 
 
 class Settings(BaseSettings):
     """Application settings."""
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        case_sensitive=False,
-        extra="ignore"
-    )
+    model_config = _ENV_CONFIG
 
     # API Keys
     anthropic_api_key: str
@@ -19,14 +24,62 @@ class Settings(BaseSettings):
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
+    # Worker processes; WEB_CONCURRENCY takes precedence over WORKERS
+    workers: int = Field(1, validation_alias=AliasChoices("web_concurrency", "workers"))
 
     # AI Model Configuration
     ai_model: str = "claude-sonnet-4-5-20250929"
+    # Faster model for news summaries, recommendations and batched comparisons
+    ai_fast_model: str = "claude-haiku-4-5-20251001"
     ai_temperature: float = 0.7
     ai_max_tokens: int = 2048
 
+    # LLM Response Cache (policy: enabled, read_only, replay, disabled)
+    llm_cache_policy: str = "enabled"
+    llm_cache_ttl_analysis: int = 900
+    llm_cache_ttl_news: int = 3600
+
+    # Market Data Cache (seconds to reuse metrics and price summaries)
+    market_data_cache_ttl: int = 300
+
+
+class CorsSettings(BaseSettings):
+    """CORS settings, read separately because the middleware is added at import."""
+
+    model_config = _ENV_CONFIG
+
+    # Allowed browser origins (JSON list in the environment)
+    cors_origins: list[str] = ["http://localhost:3000"]
 
-@lru_cache()
+
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
+
+
+@cache
+def get_cors_settings() -> CorsSettings:
+    """Get cached CORS settings; unlike get_settings(), never requires the API keys."""
+    return CorsSettings()
+
+
+# Hot settings exposed as module-level constants. They are resolved on first
+# access (rather than at import) so importing this module never requires the
+# API keys to be configured, then stored as plain globals.
+_HOT_SETTINGS = {
+    "AI_MODEL": "ai_model",
+    "AI_FAST_MODEL": "ai_fast_model",
+    "AI_TEMPERATURE": "ai_temperature",
+    "AI_MAX_TOKENS": "ai_max_tokens",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve hot settings constants such as AI_MODEL on first access."""
+    field = _HOT_SETTINGS.get(name)
+    if field is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(get_settings(), field)
+    globals()[name] = value
+    return value
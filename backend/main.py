@@ -1,12 +1,19 @@
 """Main FastAPI application for Finance AI Agent."""
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+from cachetools import TTLCache
+import httpx
 import logging
 
-from backend.config import get_settings
+from backend import config
+from backend.config import get_cors_settings, get_settings
 from backend.routes import stock, news, analysis
+from backend.services.llm_cache import LLMCache
+from backend.services.news_service import NewsService
+from backend.services.portfolio_analyzer import PortfolioAnalyzer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,10 +26,44 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Finance AI Agent API...")
     settings = get_settings()
+    app.state.settings = settings
+
+    # Pooled HTTP/2 client shared by async upstream calls
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        timeout=10
+    )
+    # Build long-lived services once and share them across requests; the
+    # news routes and the analyzer use one NewsService, and so one news cache
+    app.state.news_service = NewsService(
+        api_key=settings.finnhub_api_key,
+        http_client=app.state.http
+    )
+    app.state.portfolio_analyzer = PortfolioAnalyzer(
+        anthropic_api_key=settings.anthropic_api_key,
+        finnhub_api_key=settings.finnhub_api_key,
+        ai_model=config.AI_MODEL,
+        llm_cache=LLMCache(
+            policy=settings.llm_cache_policy,
+            analysis_ttl=settings.llm_cache_ttl_analysis,
+            news_ttl=settings.llm_cache_ttl_news
+        ),
+        http_client=app.state.http,
+        ai_fast_model=config.AI_FAST_MODEL,
+        news_service=app.state.news_service
+    )
+    # Short-lived caches for market data routes, keyed by (ticker,) / (ticker, period)
+    app.state.metrics_cache = TTLCache(maxsize=512, ttl=settings.market_data_cache_ttl)
+    app.state.summary_cache = TTLCache(maxsize=512, ttl=settings.market_data_cache_ttl)
+
     logger.info(f"Server running on {settings.host}:{settings.port}")
     yield
     # Shutdown
     logger.info("Shutting down Finance AI Agent API...")
+    app.state.portfolio_analyzer.close()
+    app.state.news_service.close()
+    await app.state.http.aclose()
 
 
 # Create FastAPI app
@@ -31,17 +72,40 @@ app = FastAPI(
     description="AI-powered financial analysis and investment insights",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
 
-# Configure CORS
+
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that leaves */stream endpoints uncompressed.
+
+    The gzip encoder buffers streamed chunks until enough output accumulates,
+    which would hold back incremental text and server-sent events.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress larger payloads (history, news lists); registered before CORS so that
+# CORS stays the outermost middleware and still decorates every response
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Configure CORS with explicit origins; credentials cannot be combined with "*",
+# and max_age lets browsers cache preflight responses for a day
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
+    allow_origins=get_cors_settings().cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 
@@ -78,16 +142,18 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    settings = get_settings()
+    settings = request.app.state.settings
+    llm_cache = request.app.state.portfolio_analyzer.ai_service.cache
     return {
         "status": "healthy",
         "services": {
             "stock_data": "available",
             "news": "available" if settings.finnhub_api_key else "unavailable",
             "ai_agent": "available" if settings.anthropic_api_key else "unavailable"
-        }
+        },
+        "llm_cache": llm_cache.stats() if llm_cache else None
     }
 
 
@@ -104,5 +170,7 @@ if __name__ == "__main__":
         "backend.main:app",
         host=settings.host,
         port=settings.port,
-        reload=True
+        workers=settings.workers,
+        # Auto-reload only supports a single worker process
+        reload=settings.workers == 1
     )
@@ -1,9 +1,11 @@
 """AI analysis API routes."""
-from fastapi import APIRouter, HTTPException, Body
-from typing import Optional, List
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, HTTPException, Body, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, Optional, List, Dict, Any, Type, TypeVar
+from pydantic import BaseModel, ValidationError
 from backend.services.portfolio_analyzer import PortfolioAnalyzer
-from backend.config import get_settings
 
 router = APIRouter()
 
@@ -14,6 +16,8 @@ class AnalysisRequest(BaseModel):
     ticker: str
     question: Optional[str] = None
     include_recommendation: bool = True
+    cache_only: bool = False
+    bypass_cache: bool = False
 
 
 class QuestionRequest(BaseModel):
@@ -25,20 +29,80 @@ class QuestionRequest(BaseModel):
 class CompareRequest(BaseModel):
     """Request model for stock comparison."""
     tickers: List[str]
+    include_analysis: bool = False
 
 
-def get_portfolio_analyzer():
-    """Get portfolio analyzer instance with API keys from settings."""
-    settings = get_settings()
-    return PortfolioAnalyzer(
-        anthropic_api_key=settings.anthropic_api_key,
-        finnhub_api_key=settings.finnhub_api_key,
-        ai_model=settings.ai_model
-    )
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Pre-encoded bodies for the common 400 responses. Response objects are built
+# per request because middleware (e.g. CORS) mutates their headers in place.
+_ERR_ANALYSIS_FAILED = orjson.dumps({"detail": "Analysis failed"})
+_ERR_QUESTION_FAILED = orjson.dumps({"detail": "Failed to answer question"})
+_ERR_SUMMARY_FAILED = orjson.dumps({"detail": "Failed to generate summary"})
+_ERR_TOO_FEW_TICKERS = orjson.dumps({"detail": "At least 2 tickers required for comparison"})
+_ERR_TOO_MANY_TICKERS = orjson.dumps({"detail": "Maximum 10 tickers allowed"})
+_ERR_CACHE_FLAGS = orjson.dumps({"detail": "cache_only and bypass_cache cannot both be set"})
+
+
+def get_portfolio_analyzer(request: Request) -> PortfolioAnalyzer:
+    """Get the shared portfolio analyzer created at application startup."""
+    return request.app.state.portfolio_analyzer
+
+
+def _json_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for handlers that parse the raw body themselves."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+
+def _bad_request(body: bytes, detail: Optional[str] = None) -> Response:
+    """
+    Build a 400 response without going through the exception handlers.
+
+    Args:
+        body: Pre-encoded fallback body
+        detail: Specific error message, if the service returned one
 
+    Returns:
+        JSON response with status 400
+    """
+    if detail:
+        body = orjson.dumps({"detail": detail})
+    return Response(content=body, status_code=400, media_type="application/json")
+
+
+async def _parse_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """
+    Parse and validate a JSON request body in a single pass.
+
+    Args:
+        request: Incoming request
+        model: Pydantic model describing the body
+
+    Returns:
+        Validated model instance
 
-@router.post("/analyze")
-async def analyze_investment(request: AnalysisRequest):
+    Raises:
+        RequestValidationError: If the body is not valid JSON or fails validation
+    """
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+
+@router.post("/analyze", response_model=None, openapi_extra=_json_body(AnalysisRequest))
+async def analyze_investment(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
     """
     Perform comprehensive AI-powered investment analysis.
 
@@ -52,20 +116,33 @@ async def analyze_investment(request: AnalysisRequest):
         "include_recommendation": true
     }
     ```
+
+    Set `"cache_only": true` to poll for a cached analysis without calling the
+    AI model; a miss returns `{"success": false, "error": "cache miss"}` with HTTP 200.
+    Set `"bypass_cache": true` to force a fresh analysis. The two flags are
+    mutually exclusive (HTTP 400).
     """
-    try:
-        analyzer = get_portfolio_analyzer()
+    body = await _parse_body(request, AnalysisRequest)
+
+    if body.cache_only and body.bypass_cache:
+        return _bad_request(_ERR_CACHE_FLAGS)
 
-        result = analyzer.analyze_investment(
-            ticker=request.ticker.upper(),
-            user_question=request.question,
-            include_recommendation=request.include_recommendation
+    try:
+        result = await analyzer.analyze_investment_async(
+            ticker=body.ticker.upper(),
+            user_question=body.question,
+            include_recommendation=body.include_recommendation,
+            cache_only=body.cache_only,
+            bypass_cache=body.bypass_cache
         )
 
+        if result.get("cache_miss"):
+            return ORJSONResponse(result)
+
         if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error", "Analysis failed"))
+            return _bad_request(_ERR_ANALYSIS_FAILED, result.get("error"))
 
-        return result
+        return ORJSONResponse(result)
 
     except HTTPException:
         raise
@@ -73,8 +150,79 @@ async def analyze_investment(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/ask")
-async def ask_question(request: QuestionRequest):
+def _sse(event: str, payload: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+
+@router.post("/analyze/stream", response_model=None, openapi_extra=_json_body(AnalysisRequest))
+async def analyze_investment_stream(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
+    """
+    Perform investment analysis and stream it as server-sent events.
+
+    Events, in order: `data` (stock info, metrics and news sentiment),
+    `analysis` (JSON-encoded chunks of the AI analysis text, as generated),
+    `recommendation` (if requested) and `done`. A failure after streaming has
+    started is reported as an `error` event.
+
+    `cache_only` and `bypass_cache` behave as in `/analyze`; with `cache_only`,
+    a miss sends a `cache_miss` event in place of the rest of the analysis.
+    The two flags are mutually exclusive (HTTP 400).
+
+    **Example request:**
+    ```json
+    {
+        "ticker": "AAPL",
+        "include_recommendation": true
+    }
+    ```
+    """
+    body = await _parse_body(request, AnalysisRequest)
+
+    if body.cache_only and body.bypass_cache:
+        return _bad_request(_ERR_CACHE_FLAGS)
+
+    events = analyzer.analyze_investment_stream(
+        ticker=body.ticker.upper(),
+        user_question=body.question,
+        include_recommendation=body.include_recommendation,
+        cache_only=body.cache_only,
+        bypass_cache=body.bypass_cache
+    )
+
+    # Pull the first event before responding so data errors still map to a status code
+    try:
+        first = await events.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        yield _sse(*first)
+        try:
+            async for event in events:
+                yield _sse(*event)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+            return
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.post("/ask", response_model=None, openapi_extra=_json_body(QuestionRequest))
+async def ask_question(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
     """
     Ask a specific question about a stock.
 
@@ -88,18 +236,18 @@ async def ask_question(request: QuestionRequest):
     }
     ```
     """
-    try:
-        analyzer = get_portfolio_analyzer()
+    body = await _parse_body(request, QuestionRequest)
 
-        result = analyzer.answer_question(
-            ticker=request.ticker.upper(),
-            question=request.question
+    try:
+        result = await analyzer.answer_question_async(
+            ticker=body.ticker.upper(),
+            question=body.question
         )
 
         if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error", "Failed to answer question"))
+            return _bad_request(_ERR_QUESTION_FAILED, result.get("error"))
 
-        return result
+        return ORJSONResponse(result)
 
     except HTTPException:
         raise
@@ -107,36 +255,84 @@ async def ask_question(request: QuestionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/compare")
-async def compare_stocks(request: CompareRequest):
+@router.post("/ask/stream", response_model=None, openapi_extra=_json_body(QuestionRequest))
+async def ask_question_stream(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
     """
-    Compare multiple stocks side by side.
+    Ask a specific question about a stock and stream the answer.
 
-    Returns key metrics for each stock.
+    The answer is returned as plain text, sent chunk by chunk as it is generated.
 
     **Example request:**
     ```json
     {
-        "tickers": ["AAPL", "GOOGL", "MSFT"]
+        "ticker": "TSLA",
+        "question": "Is this stock overvalued?"
     }
     ```
     """
+    body = await _parse_body(request, QuestionRequest)
+    chunks = analyzer.answer_question_stream(
+        ticker=body.ticker.upper(),
+        question=body.question
+    )
+
+    # Pull the first chunk before responding so upstream errors still map to a status code
     try:
-        if len(request.tickers) < 2:
-            raise HTTPException(status_code=400, detail="At least 2 tickers required for comparison")
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if len(request.tickers) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 tickers allowed")
+    async def body_stream() -> AsyncIterator[str]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
 
-        analyzer = get_portfolio_analyzer()
-        tickers = [t.upper() for t in request.tickers]
+    return StreamingResponse(body_stream(), media_type="text/plain")
+
+
+@router.post("/compare", response_model=None, openapi_extra=_json_body(CompareRequest))
+async def compare_stocks(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
+    """
+    Compare multiple stocks side by side.
+
+    Returns key metrics for each stock, plus an AI analysis of each when
+    include_analysis is set.
+
+    **Example request:**
+    ```json
+    {
+        "tickers": ["AAPL", "GOOGL", "MSFT"],
+        "include_analysis": false
+    }
+    ```
+    """
+    body = await _parse_body(request, CompareRequest)
 
-        result = analyzer.compare_stocks(tickers)
+    if len(body.tickers) < 2:
+        return _bad_request(_ERR_TOO_FEW_TICKERS)
 
-        return {
+    if len(body.tickers) > 10:
+        return _bad_request(_ERR_TOO_MANY_TICKERS)
+
+    try:
+        tickers = [t.upper() for t in body.tickers]
+
+        result = await analyzer.compare_stocks(tickers, include_analysis=body.include_analysis)
+
+        return ORJSONResponse({
             "success": True,
             "data": result
-        }
+        })
 
     except HTTPException:
         raise
@@ -144,22 +340,59 @@ async def compare_stocks(request: CompareRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/analyze/{ticker}/news-summary")
-async def get_news_summary(ticker: str):
+@router.post("/compare/stream", response_model=None, openapi_extra=_json_body(CompareRequest))
+async def compare_stocks_stream(
+    request: Request,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
+    """
+    Compare multiple stocks, streaming each stock's metrics as they arrive.
+
+    The response is newline-delimited JSON with one comparison entry per
+    line, in the order the stocks finish (not the request order).
+    include_analysis is not supported.
+
+    **Example request:**
+    ```json
+    {
+        "tickers": ["AAPL", "GOOGL", "MSFT"]
+    }
+    ```
+    """
+    body = await _parse_body(request, CompareRequest)
+
+    if len(body.tickers) < 2:
+        return _bad_request(_ERR_TOO_FEW_TICKERS)
+
+    if len(body.tickers) > 10:
+        return _bad_request(_ERR_TOO_MANY_TICKERS)
+
+    rows = analyzer.compare_stocks_iter([t.upper() for t in body.tickers])
+
+    async def body_stream() -> AsyncIterator[bytes]:
+        async for row in rows:
+            yield orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+
+    return StreamingResponse(body_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/analyze/{ticker}/news-summary", response_model=None)
+async def get_news_summary(
+    ticker: str,
+    analyzer: PortfolioAnalyzer = Depends(get_portfolio_analyzer)
+):
     """
     Get AI-powered news summary for a stock.
 
     Returns summarized news with key insights.
     """
     try:
-        analyzer = get_portfolio_analyzer()
-
-        result = analyzer.get_news_summary(ticker.upper())
+        result = await analyzer.get_news_summary_async(ticker.upper())
 
         if not result.get("success"):
-            raise HTTPException(status_code=400, detail=result.get("error", "Failed to generate summary"))
+            return _bad_request(_ERR_SUMMARY_FAILED, result.get("error"))
 
-        return result
+        return ORJSONResponse(result)
 
     except HTTPException:
         raise
@@ -1,25 +1,48 @@
 """News API routes."""
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import ORJSONResponse
 from typing import Optional
-from datetime import datetime, timedelta
-from backend.services.news_service import NewsService
-from backend.config import get_settings
+from backend.services.news_service import NewsService, default_date_range
 
 router = APIRouter()
 
 
-def get_news_service():
-    """Get news service instance with API key from settings."""
-    settings = get_settings()
-    return NewsService(api_key=settings.finnhub_api_key)
+def get_news_service(request: Request) -> NewsService:
+    """Get the shared news service created at application startup."""
+    return request.app.state.news_service
 
 
-@router.get("/news/{ticker}")
+@router.get("/news/market", response_model=None)
+async def get_market_news(
+    category: str = Query("general", description="News category (general, forex, crypto, merger)"),
+    limit: int = Query(20, ge=1, le=50, description="Number of articles (1-50)"),
+    news_service: NewsService = Depends(get_news_service)
+):
+    """
+    Get general market news.
+
+    Categories: general, forex, crypto, merger
+    """
+    try:
+        news = await news_service.get_market_news_async(category=category, limit=limit)
+
+        return ORJSONResponse({
+            "success": True,
+            "data": news,
+            "count": len(news),
+            "category": category
+        })
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/news/{ticker}", response_model=None)
 async def get_company_news(
     ticker: str,
     from_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     to_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    limit: int = Query(20, ge=1, le=50, description="Number of articles (1-50)")
+    limit: int = Query(20, ge=1, le=50, description="Number of articles (1-50)"),
+    news_service: NewsService = Depends(get_news_service)
 ):
     """
     Get news articles for a specific company.
@@ -27,22 +50,17 @@ async def get_company_news(
     Returns recent news with sentiment analysis.
     """
     try:
-        news_service = get_news_service()
-
         # Set default dates if not provided
-        if not to_date:
-            to_date = datetime.now().strftime("%Y-%m-%d")
-        if not from_date:
-            from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+        from_date, to_date = default_date_range(from_date, to_date)
 
-        news = news_service.get_company_news(
+        news = await news_service.get_company_news_async(
             ticker=ticker.upper(),
             from_date=from_date,
             to_date=to_date,
             limit=limit
         )
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": news,
             "count": len(news),
@@ -51,49 +69,27 @@ async def get_company_news(
                 "from": from_date,
                 "to": to_date
             }
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/news/market")
-async def get_market_news(
-    category: str = Query("general", description="News category (general, forex, crypto, merger)"),
-    limit: int = Query(20, ge=1, le=50, description="Number of articles (1-50)")
+@router.get("/news/{ticker}/sentiment", response_model=None)
+async def get_news_sentiment(
+    ticker: str,
+    news_service: NewsService = Depends(get_news_service)
 ):
-    """
-    Get general market news.
-
-    Categories: general, forex, crypto, merger
-    """
-    try:
-        news_service = get_news_service()
-        news = news_service.get_market_news(category=category, limit=limit)
-
-        return {
-            "success": True,
-            "data": news,
-            "count": len(news),
-            "category": category
-        }
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-
-@router.get("/news/{ticker}/sentiment")
-async def get_news_sentiment(ticker: str):
     """
     Get news sentiment analysis for a ticker.
 
     Returns overall sentiment, score, and recent articles.
     """
     try:
-        news_service = get_news_service()
-        sentiment = news_service.get_news_sentiment(ticker.upper())
+        sentiment = await news_service.get_news_sentiment_async(ticker.upper())
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": sentiment
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
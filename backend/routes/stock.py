@@ -1,13 +1,24 @@
 """Stock data API routes."""
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
-from backend.services.stock_data import StockDataService
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Iterator, Optional
+from functools import cache
+import orjson
 
 router = APIRouter()
-stock_service = StockDataService()
 
+# Rows encoded per chunk when streaming historical data
+HISTORY_CHUNK_ROWS = 500
 
-@router.get("/stock/{ticker}")
+
+@cache
+def _svc():
+    """Get the stock data service, deferring the yfinance/pandas import to first use."""
+    from backend.services.stock_data import StockDataService
+    return StockDataService()
+
+
+@router.get("/stock/{ticker}", response_model=None)
 async def get_stock_info(ticker: str):
     """
     Get comprehensive stock information.
@@ -15,16 +26,37 @@ async def get_stock_info(ticker: str):
     Returns basic info, valuation metrics, and fundamentals.
     """
     try:
-        info = stock_service.get_stock_info(ticker.upper())
-        return {
+        info = await _svc().get_stock_info_async(ticker.upper())
+        return ORJSONResponse({
             "success": True,
             "data": info
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/stock/{ticker}/history")
+def _stream_history(hist, period: str, interval: str) -> Iterator[bytes]:
+    """
+    Encode historical data as a JSON envelope, a chunk of rows at a time.
+
+    Args:
+        hist: DataFrame of OHLCV data with a datetime index
+        period: Requested period, echoed in the envelope
+        interval: Requested interval, echoed in the envelope
+
+    Yields:
+        Consecutive pieces of the JSON response body
+    """
+    yield b'{"success":true,"data":['
+    records = hist.reset_index()
+    for start in range(0, len(records), HISTORY_CHUNK_ROWS):
+        chunk = records.iloc[start:start + HISTORY_CHUNK_ROWS].to_json(orient="records", date_format="iso")
+        # Strip the enclosing brackets so the chunks join into a single array
+        yield (b"," if start else b"") + chunk[1:-1].encode("utf-8")
+    yield b'],' + orjson.dumps({"period": period, "interval": interval})[1:]
+
+
+@router.get("/stock/{ticker}/history", response_model=None)
 async def get_stock_history(
     ticker: str,
     period: str = Query("1mo", description="Time period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)"),
@@ -36,58 +68,56 @@ async def get_stock_history(
     Returns OHLCV (Open, High, Low, Close, Volume) data.
     """
     try:
-        hist = stock_service.get_historical_data(ticker.upper(), period=period, interval=interval)
+        hist = await _svc().get_historical_data_async(ticker.upper(), period=period, interval=interval)
 
         # Convert DataFrame to JSON-serializable format
         if hist.empty:
-            return {
+            return ORJSONResponse({
                 "success": True,
                 "data": [],
                 "message": "No historical data available"
-            }
-
-        hist_data = hist.reset_index().to_dict(orient="records")
-        # Convert Timestamp to string
-        for record in hist_data:
-            if 'Date' in record:
-                record['Date'] = record['Date'].isoformat()
+            })
 
-        return {
-            "success": True,
-            "data": hist_data,
-            "period": period,
-            "interval": interval
-        }
+        return StreamingResponse(
+            _stream_history(hist, period, interval),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/stock/{ticker}/metrics")
-async def get_financial_metrics(ticker: str):
+@router.get("/stock/{ticker}/metrics", response_model=None)
+async def get_financial_metrics(ticker: str, request: Request):
     """
     Get detailed financial metrics.
 
     Returns valuation, profitability, growth, and financial health metrics.
     """
     try:
-        metrics = stock_service.get_financial_metrics(ticker.upper())
+        cache = request.app.state.metrics_cache
+        key = (ticker.upper(),)
+        metrics = cache.get(key)
+
+        if metrics is None:
+            metrics = await _svc().get_financial_metrics_async(ticker.upper())
 
-        if "error" in metrics:
-            raise HTTPException(status_code=400, detail=metrics["error"])
+            if "error" in metrics:
+                return ORJSONResponse({"detail": metrics["error"]}, status_code=400)
 
-        return {
+            cache[key] = metrics
+
+        return ORJSONResponse({
             "success": True,
             "data": metrics
-        }
-    except HTTPException:
-        raise
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/stock/{ticker}/summary")
+@router.get("/stock/{ticker}/summary", response_model=None)
 async def get_price_summary(
     ticker: str,
+    request: Request,
     period: str = Query("1y", description="Time period for analysis")
 ):
     """
@@ -96,17 +126,22 @@ async def get_price_summary(
     Returns current price, period returns, highs/lows, and volatility.
     """
     try:
-        summary = stock_service.get_price_summary(ticker.upper(), period=period)
+        cache = request.app.state.summary_cache
+        key = (ticker.upper(), period)
+        summary = cache.get(key)
+
+        if summary is None:
+            summary = await _svc().get_price_summary_async(ticker.upper(), period=period)
+
+            if "error" in summary:
+                return ORJSONResponse({"detail": summary["error"]}, status_code=400)
 
-        if "error" in summary:
-            raise HTTPException(status_code=400, detail=summary["error"])
+            cache[key] = summary
 
-        return {
+        return ORJSONResponse({
             "success": True,
             "data": summary,
             "period": period
-        }
-    except HTTPException:
-        raise
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,19 +1,225 @@
 """AI Agent service using Anthropic's Claude for financial analysis."""
-from anthropic import Anthropic
-from typing import Dict, Any, List, Optional
-import json
+from anthropic import Anthropic, AsyncAnthropic
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+import logging
+import orjson
+import re
+import threading
+import time
+from concurrent.futures import Executor
+from heapq import nlargest
+from itertools import islice
+from backend.services.llm_cache import LLMCache, CacheMiss
+
+logger = logging.getLogger(__name__)
+
+
+# Labelled lines in the structured responses ("SUMMARY: ...", "RISKS: ...")
+_NEWS_FIELD_RE = re.compile(r"^[^\S\n]*(SUMMARY|SENTIMENT|KEY POINTS):(.*)$", re.MULTILINE)
+_RECOMMENDATION_FIELD_RE = re.compile(
+    r"^[^\S\n]*(RECOMMENDATION|CONFIDENCE|REASONING|RISKS):(.*)$", re.MULTILINE
+)
+_DASH_BULLET_RE = re.compile(r"^[^\S\n]*-(.*)$", re.MULTILINE)
+# Seconds between status checks while a Message Batch is processing
+BATCH_POLL_INTERVAL = 5.0
+# Message Batch custom_id values must match ^[a-zA-Z0-9_-]{1,64}$, so tickers
+# like BRK.B are identified by position instead
+_BATCH_ID_PREFIX = "ticker-"
+# Bulleted ("- ", "• ", "* ") or numbered ("1. ") lines; captures the item text
+_KEY_POINT_RE = re.compile(r"^[^\S\n]*(?:[-•*]|\d+\.)[^\S\n]+(\S.*?)[^\S\n]*$", re.MULTILINE)
+# Complete "analysis" string value in a combined response whose JSON is truncated or wrapped
+_ANALYSIS_VALUE_RE = re.compile(r'"analysis"\s*:\s*("(?:[^"\\]|\\.)*")', re.DOTALL)
+
+
+# Retries for rate limits (429), overload/server errors (5xx), timeouts and
+# connection errors; the SDK backs off exponentially with jitter. Other 4xx
+# errors (e.g. bad requests) are never retried.
+MAX_RETRIES = 4
+
+# Process-wide Claude clients keyed by API key, so every service instance
+# shares one connection pool to the API
+_clients: Dict[str, Anthropic] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str) -> Anthropic:
+    """
+    Get the shared Anthropic client for an API key, creating it on first use.
+
+    Args:
+        api_key: Anthropic API key
+
+    Returns:
+        Anthropic client reused by all callers with the same key
+    """
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = Anthropic(api_key=api_key, max_retries=MAX_RETRIES)
+        return client
+
+
+def _extract_analysis_text(response_text: str) -> Optional[str]:
+    """Get the complete "analysis" string from a combined response that is not valid JSON."""
+    match = _ANALYSIS_VALUE_RE.search(response_text)
+    if match is None:
+        return None
+    try:
+        analysis_text = orjson.loads(match.group(1))
+    except orjson.JSONDecodeError:
+        return None
+    return analysis_text.strip() or None
+
+
+def _parse_json_object(response_text: str) -> Dict[str, Any]:
+    """
+    Parse the JSON object in a model response, tolerating prose or code fences around it.
+
+    Raises:
+        ValueError: If the response does not contain a JSON object
+    """
+    start, end = response_text.find("{"), response_text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("Response did not contain a JSON object")
+
+    payload = orjson.loads(response_text[start:end + 1])
+    if not isinstance(payload, dict):
+        raise ValueError("Response did not contain a JSON object")
+    return payload
+
+
+class _NotAvailable(dict):
+    """Mapping for str.format_map() that renders missing keys as 'N/A'."""
+
+    def __missing__(self, key: str) -> str:
+        return "N/A"
 
 
 class AIAgentService:
     """Service for AI-powered financial analysis using Claude."""
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-5-20250929"):
+    _SYSTEM_PROMPT = """You are an expert financial analyst and investment advisor with deep knowledge of:
+- Fundamental analysis (P/E ratios, earnings, revenue, margins, etc.)
+- Market sentiment and news analysis
+- Risk assessment and portfolio management
+- Technical and quantitative analysis
+
+Your role is to:
+1. Provide objective, data-driven analysis
+2. Explain complex financial concepts clearly
+3. Consider both opportunities and risks
+4. Give actionable insights for investors
+5. Be honest about uncertainty and limitations
+
+Always base your analysis on the provided data and clearly state when you're making assumptions."""
+
+    # Role-specific instructions sent after the shared system prompt
+    _NEWS_ROLE_PROMPT = "For this request, act as a financial news analyst. Summarize news articles and extract key insights that would impact investment decisions."
+    _RECOMMENDATION_ROLE_PROMPT = "For this request, act as a financial advisor providing investment recommendations. Be objective and consider both risks and opportunities."
+
+    # Tickers per Claude call in analyze_stocks_batch(), to stay well inside context limits
+    BATCH_SIZE = 5
+
+    _BATCH_PROMPT_TEMPLATE = """{contexts}
+
+Provide a concise investment analysis (2-3 sentences) and exactly 3 key points for each of the stocks above: {tickers}.
+
+Respond with only a JSON object in this format:
+{{"analyses": [{{"ticker": "TICKER", "analysis": "analysis text", "key_points": ["point 1", "point 2", "point 3"]}}]}}
+"""
+
+    # Appended to an analysis prompt so one call returns the analysis and the recommendation
+    _COMBINED_PROMPT_TEMPLATE = """{analysis_prompt}
+
+Include exactly 3 key points. Then give a recommendation (BUY/HOLD/SELL) with a confidence level (High/Medium/Low), brief reasoning (2-3 sentences) and key risk factors.
+
+Respond with only a JSON object in this format:
+{{"analysis": "full analysis text", "key_points": ["point 1", "point 2", "point 3"], "recommendation": "BUY", "confidence": "Medium", "reasoning": "reasoning text", "risks": "key risks"}}
+"""
+
+    # Structured prompts end with an END line; generation stops there
+    _STOP_SEQUENCES = ["\nEND"]
+
+    _NEWS_PROMPT_TEMPLATE = """Analyze the following news articles for {ticker}:
+
+{news_text}
+
+Provide:
+1. A brief summary (2-3 sentences)
+2. Overall sentiment (positive/negative/neutral)
+3. Exactly 3 key points that investors should know
+
+Format your response as:
+SUMMARY: [your summary]
+SENTIMENT: [positive/negative/neutral]
+KEY POINTS:
+- [point 1]
+- [point 2]
+- [point 3]
+END
+"""
+
+    _RECOMMENDATION_PROMPT_TEMPLATE = """Based on the following analysis for {ticker}:
+
+{analysis}
+
+Current Price: ${current_price}
+P/E Ratio: {pe_ratio}
+Market Cap: {market_cap}
+
+Provide a recommendation (BUY/HOLD/SELL) with:
+1. Your recommendation
+2. Confidence level (High/Medium/Low)
+3. Brief reasoning (2-3 sentences)
+4. Key risk factors
+
+Format as:
+RECOMMENDATION: [BUY/HOLD/SELL]
+CONFIDENCE: [High/Medium/Low]
+REASONING: [your reasoning]
+RISKS: [key risks]
+END
+"""
+
+    # Static layout of the stock section of the analysis context
+    _CONTEXT_TEMPLATE = (
+        "Stock Analysis for {ticker} ({name})\n"
+        "\n"
+        "\nCurrent Price: ${current_price}\n"
+        "Market Cap: {market_cap_display}\n"
+        "Sector: {sector}\n"
+        "Industry: {industry}\n"
+        "\n\nValuation Metrics:\n"
+        "- P/E Ratio: {pe_ratio}\n"
+        "- Forward P/E: {forward_pe}\n"
+        "- Beta: {beta}\n"
+        "\n\nProfitability:\n"
+        "- Profit Margin: {profit_margins_display}\n"
+        "- Operating Margin: {operating_margins_display}\n"
+        "- ROE: {return_on_equity_display}\n"
+        "\n\nGrowth:\n"
+        "- Earnings Growth: {earnings_growth_display}\n"
+        "- Revenue Growth: {revenue_growth_display}"
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-5-20250929",
+        cache: Optional[LLMCache] = None,
+        fast_model: str = "claude-haiku-4-5-20251001"
+    ):
         """
         Initialize AI agent service.
 
         Args:
             api_key: Anthropic API key (required)
-            model: Claude model to use (default: claude-sonnet-4-5-20250929)
+            model: Claude model for in-depth analysis and questions
+                (default: claude-sonnet-4-5-20250929)
+            cache: Optional response cache shared across calls
+            fast_model: Claude model for short structured tasks: news
+                summaries, recommendations and batched comparisons
+                (default: claude-haiku-4-5-20251001)
 
         Raises:
             ValueError: If API key is not provided
@@ -23,14 +229,37 @@ class AIAgentService:
 
         self.api_key = api_key
         self.model = model
-        self.client = Anthropic(api_key=api_key)
+        self.fast_model = fast_model
+        self.cache = cache
+        self._client: Optional[Anthropic] = None
+        self._async_client: Optional[AsyncAnthropic] = None
+
+    @property
+    def client(self) -> Anthropic:
+        """Shared Claude client for this API key, created on first use."""
+        if self._client is None:
+            self._client = get_client(self.api_key)
+        return self._client
+
+    @client.setter
+    def client(self, client: Anthropic) -> None:
+        self._client = client
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Async Claude client, created on first use by the *_async methods."""
+        if self._async_client is None:
+            self._async_client = AsyncAnthropic(api_key=self.api_key, max_retries=MAX_RETRIES)
+        return self._async_client
 
     def analyze_stock(
         self,
         ticker: str,
         stock_data: Dict[str, Any],
         news: List[Dict[str, Any]],
-        user_question: Optional[str] = None
+        user_question: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Perform comprehensive stock analysis using AI.
@@ -40,45 +269,101 @@ class AIAgentService:
             stock_data: Dictionary with stock information and metrics
             news: List of recent news articles
             user_question: Optional specific question from user
+            cache_only: Only return a cached analysis; never call the API
+            bypass_cache: Ignore any cached analysis and call the API
 
         Returns:
             Dictionary with AI analysis, recommendation, and key points
 
+        Raises:
+            CacheMiss: If cache_only is set and no cached analysis exists
+
         Example:
             >>> agent = AIAgentService("your_api_key")
             >>> analysis = agent.analyze_stock("AAPL", stock_data, news)
         """
-        # Build context from stock data and news
-        context = self._build_analysis_context(ticker, stock_data, news)
+        request = self._analysis_request(ticker, stock_data, news, user_question)
 
-        # Create the prompt
-        system_prompt = self._get_system_prompt()
+        try:
+            # Call Claude API
+            analysis_text = self._complete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
 
-        if user_question:
-            user_prompt = f"{context}\n\nUser Question: {user_question}\n\nProvide a detailed analysis addressing the user's question."
-        else:
-            user_prompt = f"{context}\n\nProvide a comprehensive investment analysis for {ticker}."
+            # Parse and structure the response
+            return self._structure_analysis(ticker, analysis_text, stock_data)
+
+        except CacheMiss:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error generating analysis: {str(e)}")
+
+    async def analyze_stock_async(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async version of analyze_stock() for use from the event loop.
+
+        Example:
+            >>> analysis = await agent.analyze_stock_async("AAPL", stock_data, news)
+        """
+        request = self._analysis_request(ticker, stock_data, news, user_question)
 
         try:
-            # Call Claude API
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                temperature=0.7,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            analysis_text = await self._acomplete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
+            return self._structure_analysis(ticker, analysis_text, stock_data)
 
-            # Extract response
-            analysis_text = message.content[0].text
+        except CacheMiss:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error generating analysis: {str(e)}")
 
-            # Parse and structure the response
-            result = self._structure_analysis(ticker, analysis_text, stock_data)
+    async def analyze_stock_stream(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Stream a stock analysis as text chunks while Claude generates it.
+
+        Shares the response cache with analyze_stock(); a cached analysis is
+        yielded as a single chunk.
 
-            return result
+        Args:
+            ticker: Stock ticker symbol
+            stock_data: Dictionary with stock information and metrics
+            news: List of recent news articles
+            user_question: Optional specific question from user
+            cache_only: Only return a cached analysis; never call the API
+            bypass_cache: Ignore any cached analysis and call the API
+
+        Yields:
+            Chunks of the analysis text, in order
+
+        Raises:
+            CacheMiss: If cache_only is set and no cached analysis exists
+            ValueError: If the Claude API call fails
+
+        Example:
+            >>> async for chunk in agent.analyze_stock_stream("AAPL", stock_data, news):
+            ...     print(chunk, end="")
+        """
+        request = self._analysis_request(ticker, stock_data, news, user_question)
 
+        try:
+            async for chunk in self._astream(**request, cache_only=cache_only, bypass_cache=bypass_cache):
+                yield chunk
+
+        except CacheMiss:
+            raise
         except Exception as e:
             raise ValueError(f"Error generating analysis: {str(e)}")
 
@@ -105,23 +390,66 @@ class AIAgentService:
             >>> agent = AIAgentService("your_api_key")
             >>> answer = agent.answer_question("AAPL", "Is this a good long-term investment?", data, news)
         """
-        context = self._build_analysis_context(ticker, stock_data, news)
-        system_prompt = self._get_system_prompt()
+        request = self._question_request(ticker, question, stock_data, news)
+
+        try:
+            return self._complete(**request)
+
+        except Exception as e:
+            raise ValueError(f"Error answering question: {str(e)}")
+
+    async def answer_question_async(
+        self,
+        ticker: str,
+        question: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Async version of answer_question() for use from the event loop.
 
-        user_prompt = f"{context}\n\nQuestion: {question}\n\nProvide a clear, concise answer based on the data provided."
+        Example:
+            >>> answer = await agent.answer_question_async("AAPL", "Is it overvalued?", data, news)
+        """
+        request = self._question_request(ticker, question, stock_data, news)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                temperature=0.7,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            return await self._acomplete(**request)
+
+        except Exception as e:
+            raise ValueError(f"Error answering question: {str(e)}")
+
+    async def answer_question_stream(
+        self,
+        ticker: str,
+        question: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """
+        Stream the answer to a question as text chunks while Claude generates it.
+
+        Args:
+            ticker: Stock ticker symbol
+            question: User's question
+            stock_data: Stock information and metrics
+            news: Recent news articles
 
-            return message.content[0].text
+        Yields:
+            Chunks of the answer text, in order
+
+        Raises:
+            ValueError: If the Claude API call fails
+
+        Example:
+            >>> async for chunk in agent.answer_question_stream("AAPL", "Is it overvalued?", data, news):
+            ...     print(chunk, end="")
+        """
+        request = self._question_request(ticker, question, stock_data, news)
+
+        try:
+            async for chunk in self._astream(**request):
+                yield chunk
 
         except Exception as e:
             raise ValueError(f"Error answering question: {str(e)}")
@@ -146,70 +474,47 @@ class AIAgentService:
             >>> summary = agent.summarize_news("AAPL", news_articles)
         """
         if not news:
-            return {
-                "ticker": ticker,
-                "summary": "No recent news available.",
-                "sentiment": "neutral",
-                "key_points": []
-            }
+            return self._news_summary_result(ticker, "No recent news available.")
 
-        # Format news for the prompt
-        news_text = self._format_news_for_prompt(news)
+        request = self._news_summary_request(ticker, news)
 
-        system_prompt = "You are a financial news analyst. Summarize news articles and extract key insights that would impact investment decisions."
+        try:
+            response_text = self._complete(**request)
+            return self._news_summary_result(ticker, **self._parse_news_summary(response_text))
 
-        user_prompt = f"""Analyze the following news articles for {ticker}:
+        except Exception as e:
+            return self._news_summary_result(ticker, f"Error summarizing news: {str(e)}")
 
-{news_text}
+    async def summarize_news_async(
+        self,
+        ticker: str,
+        news: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Async version of summarize_news() for use from the event loop.
 
-Provide:
-1. A brief summary (2-3 sentences)
-2. Overall sentiment (positive/negative/neutral)
-3. 3-5 key points that investors should know
+        Example:
+            >>> summary = await agent.summarize_news_async("AAPL", news_articles)
+        """
+        if not news:
+            return self._news_summary_result(ticker, "No recent news available.")
 
-Format your response as:
-SUMMARY: [your summary]
-SENTIMENT: [positive/negative/neutral]
-KEY POINTS:
-- [point 1]
-- [point 2]
-- [point 3]
-"""
+        request = self._news_summary_request(ticker, news)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                temperature=0.5,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-
-            response_text = message.content[0].text
-            parsed = self._parse_news_summary(response_text)
-
-            return {
-                "ticker": ticker,
-                "summary": parsed["summary"],
-                "sentiment": parsed["sentiment"],
-                "key_points": parsed["key_points"]
-            }
+            response_text = await self._acomplete(**request)
+            return self._news_summary_result(ticker, **self._parse_news_summary(response_text))
 
         except Exception as e:
-            return {
-                "ticker": ticker,
-                "summary": f"Error summarizing news: {str(e)}",
-                "sentiment": "neutral",
-                "key_points": []
-            }
+            return self._news_summary_result(ticker, f"Error summarizing news: {str(e)}")
 
     def generate_recommendation(
         self,
         ticker: str,
         analysis: str,
-        stock_data: Dict[str, Any]
+        stock_data: Dict[str, Any],
+        cache_only: bool = False,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Generate investment recommendation based on analysis.
@@ -218,84 +523,818 @@ KEY POINTS:
             ticker: Stock ticker symbol
             analysis: Previous analysis text
             stock_data: Stock information
+            cache_only: Only return a cached recommendation; never call the API
+            bypass_cache: Ignore any cached recommendation and call the API
 
         Returns:
             Dictionary with recommendation, confidence, and reasoning
 
+        Raises:
+            CacheMiss: If cache_only is set and no cached recommendation exists
+
         Example:
             >>> agent = AIAgentService("your_api_key")
             >>> rec = agent.generate_recommendation("AAPL", analysis_text, data)
         """
-        system_prompt = "You are a financial advisor providing investment recommendations. Be objective and consider both risks and opportunities."
+        request = self._recommendation_request(ticker, analysis, stock_data)
 
-        user_prompt = f"""Based on the following analysis for {ticker}:
+        try:
+            response_text = self._complete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
+            return {"ticker": ticker, **self._parse_recommendation(response_text)}
 
-{analysis}
+        except CacheMiss:
+            raise
+        except Exception as e:
+            return self._recommendation_error(ticker, e)
 
-Current Price: ${stock_data.get('current_price', 'N/A')}
-P/E Ratio: {stock_data.get('pe_ratio', 'N/A')}
-Market Cap: ${stock_data.get('market_cap', 'N/A'):,} if stock_data.get('market_cap') else 'N/A'
+    async def generate_recommendation_async(
+        self,
+        ticker: str,
+        analysis: str,
+        stock_data: Dict[str, Any],
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_recommendation() for use from the event loop.
 
-Provide a recommendation (BUY/HOLD/SELL) with:
-1. Your recommendation
-2. Confidence level (High/Medium/Low)
-3. Brief reasoning (2-3 sentences)
-4. Key risk factors
+        Example:
+            >>> rec = await agent.generate_recommendation_async("AAPL", analysis_text, data)
+        """
+        request = self._recommendation_request(ticker, analysis, stock_data)
 
-Format as:
-RECOMMENDATION: [BUY/HOLD/SELL]
-CONFIDENCE: [High/Medium/Low]
-REASONING: [your reasoning]
-RISKS: [key risks]
-"""
+        try:
+            response_text = await self._acomplete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
+            return {"ticker": ticker, **self._parse_recommendation(response_text)}
+
+        except CacheMiss:
+            raise
+        except Exception as e:
+            return self._recommendation_error(ticker, e)
+
+    def analyze_with_recommendation(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Generate the stock analysis and the recommendation in a single Claude call.
+
+        Saves the second round trip (and re-sending the stock context) made by
+        analyze_stock() followed by generate_recommendation(). If the JSON
+        response cannot be parsed (e.g. cut off at max_tokens), a complete
+        "analysis" value is still used when present; otherwise the analysis is
+        regenerated with analyze_stock(). The recommendation is then generated
+        separately from that analysis text.
+
+        Args:
+            ticker: Stock ticker symbol
+            stock_data: Dictionary with stock information and metrics
+            news: List of recent news articles
+            user_question: Optional specific question from user
+            cache_only: Only use cached responses; never call the API
+            bypass_cache: Ignore any cached response and call the API
+
+        Returns:
+            Tuple of (analysis, recommendation), shaped like the results of
+            analyze_stock() and generate_recommendation()
+
+        Raises:
+            CacheMiss: If cache_only is set and no cached response exists
+
+        Example:
+            >>> agent = AIAgentService("your_api_key")
+            >>> analysis, rec = agent.analyze_with_recommendation("AAPL", stock_data, news)
+            >>> rec["recommendation"]  # BUY/HOLD/SELL
+        """
+        request = self._combined_request(ticker, stock_data, news, user_question)
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=512,
-                temperature=0.5,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
+            response_text = self._complete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
+        except CacheMiss:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error generating analysis: {str(e)}")
+
+        try:
+            return self._parse_combined(ticker, response_text, stock_data)
+        except ValueError:
+            pass
+
+        analysis_text = _extract_analysis_text(response_text)
+        if analysis_text is not None:
+            analysis = self._structure_analysis(ticker, analysis_text, stock_data)
+        else:
+            analysis = self.analyze_stock(
+                ticker, stock_data, news, user_question, cache_only=cache_only,
+                bypass_cache=bypass_cache
+            )
+        return analysis, self.generate_recommendation(
+            ticker, analysis["analysis"], stock_data, cache_only=cache_only,
+            bypass_cache=bypass_cache
+        )
+
+    async def analyze_with_recommendation_async(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Async version of analyze_with_recommendation() for use from the event loop.
+
+        Example:
+            >>> analysis, rec = await agent.analyze_with_recommendation_async("AAPL", stock_data, news)
+        """
+        request = self._combined_request(ticker, stock_data, news, user_question)
+
+        try:
+            response_text = await self._acomplete(**request, cache_only=cache_only, bypass_cache=bypass_cache)
+        except CacheMiss:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error generating analysis: {str(e)}")
+
+        try:
+            return self._parse_combined(ticker, response_text, stock_data)
+        except ValueError:
+            pass
+
+        analysis_text = _extract_analysis_text(response_text)
+        if analysis_text is not None:
+            analysis = self._structure_analysis(ticker, analysis_text, stock_data)
+        else:
+            analysis = await self.analyze_stock_async(
+                ticker, stock_data, news, user_question, cache_only=cache_only,
+                bypass_cache=bypass_cache
             )
+        return analysis, await self.generate_recommendation_async(
+            ticker, analysis["analysis"], stock_data, cache_only=cache_only,
+            bypass_cache=bypass_cache
+        )
+
+    def analyze_stocks_batch(
+        self,
+        tickers: List[str],
+        data_by_ticker: Dict[str, Dict[str, Any]],
+        news_by_ticker: Dict[str, List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several stocks with one Claude call per group of BATCH_SIZE tickers.
+
+        Each group shares a single request (and system prompt), and Claude
+        returns the analyses as one JSON object.
+
+        Args:
+            tickers: Stock ticker symbols
+            data_by_ticker: Stock information and metrics keyed by ticker
+            news_by_ticker: Recent news articles keyed by ticker
 
-            response_text = message.content[0].text
-            parsed = self._parse_recommendation(response_text)
+        Returns:
+            List of analysis dictionaries (same shape as analyze_stock()), in
+            input order
 
-            return {
-                "ticker": ticker,
-                "recommendation": parsed["recommendation"],
-                "confidence": parsed["confidence"],
-                "reasoning": parsed["reasoning"],
-                "risks": parsed["risks"]
-            }
+        Raises:
+            ValueError: If the API call fails or the response is missing tickers
 
+        Example:
+            >>> agent = AIAgentService("your_api_key")
+            >>> analyses = agent.analyze_stocks_batch(["AAPL", "MSFT"], data, news)
+            >>> analyses[1]["key_points"]
+        """
+        results = []
+        for start in range(0, len(tickers), self.BATCH_SIZE):
+            group = tickers[start:start + self.BATCH_SIZE]
+            request = self._batch_request(group, data_by_ticker, news_by_ticker)
+
+            try:
+                response_text = self._complete(**request)
+                analyses = self._parse_batch_analyses(response_text)
+            except Exception as e:
+                raise ValueError(f"Error generating batch analysis: {str(e)}")
+
+            missing = [ticker for ticker in group if ticker.upper() not in analyses]
+            if missing:
+                raise ValueError(f"Batch analysis missing tickers: {', '.join(missing)}")
+
+            for ticker in group:
+                item = analyses[ticker.upper()]
+                key_points = item.get("key_points") or []
+                results.append({
+                    "ticker": ticker,
+                    "analysis": item.get("analysis", ""),
+                    "key_points": key_points[:5] or ["See full analysis for details"],
+                    "current_price": data_by_ticker.get(ticker, {}).get('current_price'),
+                    "recommendation": None
+                })
+
+        return results
+
+    def compare_stocks_ai(
+        self,
+        tickers: List[str],
+        data_by_ticker: Dict[str, Dict[str, Any]],
+        news_by_ticker: Dict[str, List[Dict[str, Any]]],
+        executor: Optional[Executor] = None
+    ) -> List[Any]:
+        """
+        Analyze stocks for a comparison with analyze_stocks_batch().
+
+        If the batched analysis fails (a response cannot be parsed or is
+        missing tickers), every ticker falls back to an individual
+        analyze_stock() call, run concurrently on the given executor. A
+        fallback that fails is returned as its exception (like
+        asyncio.gather(return_exceptions=True)) so the other analyses are kept.
+
+        Args:
+            tickers: Stock ticker symbols
+            data_by_ticker: Stock information and metrics keyed by ticker
+            news_by_ticker: Recent news articles keyed by ticker
+            executor: Thread pool for the fallback calls (default: run them
+                one at a time in the calling thread)
+
+        Returns:
+            List with an analysis dictionary (same shape as analyze_stock()) or
+            the raised exception for each ticker, in input order
+
+        Example:
+            >>> agent = AIAgentService("your_api_key")
+            >>> analyses = agent.compare_stocks_ai(["AAPL", "MSFT", "GOOGL"], data, news, executor)
+        """
+        try:
+            return self.analyze_stocks_batch(tickers, data_by_ticker, news_by_ticker)
+        except ValueError:
+            pass
+
+        def analyze(ticker: str) -> Any:
+            try:
+                return self.analyze_stock(ticker, data_by_ticker.get(ticker, {}), news_by_ticker.get(ticker, []))
+            except Exception as e:
+                return e
+
+        if executor is None:
+            return [analyze(ticker) for ticker in tickers]
+        return list(executor.map(analyze, tickers))
+
+    def submit_analysis_batch(
+        self,
+        tickers: List[str],
+        data_by_ticker: Dict[str, Dict[str, Any]],
+        news_by_ticker: Dict[str, List[Dict[str, Any]]]
+    ) -> str:
+        """
+        Submit one analysis request per ticker to the Message Batches API.
+
+        Batched requests are billed at half the normal rate but complete
+        asynchronously; use collect_analysis_batch() to wait for the results.
+
+        Args:
+            tickers: Stock ticker symbols
+            data_by_ticker: Stock information and metrics keyed by ticker
+            news_by_ticker: Recent news articles keyed by ticker
+
+        Returns:
+            ID of the submitted batch
+
+        Raises:
+            ValueError: If the batch cannot be created
+
+        Example:
+            >>> agent = AIAgentService("your_api_key")
+            >>> batch_id = agent.submit_analysis_batch(["AAPL", "MSFT"], data, news)
+        """
+        requests = []
+        for index, ticker in enumerate(tickers):
+            request = self._analysis_request(
+                ticker, data_by_ticker.get(ticker, {}), news_by_ticker.get(ticker, []), None
+            )
+            requests.append({
+                "custom_id": f"{_BATCH_ID_PREFIX}{index}",
+                "params": self._message_params(**request)
+            })
+
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
         except Exception as e:
-            return {
-                "ticker": ticker,
-                "recommendation": "HOLD",
-                "confidence": "Low",
-                "reasoning": f"Error generating recommendation: {str(e)}",
-                "risks": "Unable to assess risks due to error."
-            }
+            raise ValueError(f"Error submitting analysis batch: {str(e)}")
 
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for the AI agent."""
-        return """You are an expert financial analyst and investment advisor with deep knowledge of:
-- Fundamental analysis (P/E ratios, earnings, revenue, margins, etc.)
-- Market sentiment and news analysis
-- Risk assessment and portfolio management
-- Technical and quantitative analysis
+        return batch.id
 
-Your role is to:
-1. Provide objective, data-driven analysis
-2. Explain complex financial concepts clearly
-3. Consider both opportunities and risks
-4. Give actionable insights for investors
-5. Be honest about uncertainty and limitations
+    def collect_analysis_batch(
+        self,
+        batch_id: str,
+        tickers: List[str],
+        data_by_ticker: Dict[str, Dict[str, Any]],
+        timeout: float = 300.0,
+        poll_interval: float = BATCH_POLL_INTERVAL
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for a batch from submit_analysis_batch() and parse its results.
 
-Always base your analysis on the provided data and clearly state when you're making assumptions."""
+        If the batch has not ended within the timeout it is cancelled and no
+        results are returned. Requests that errored or expired are left out,
+        so callers can fall back to analyze_stock() for any missing ticker.
+
+        Args:
+            batch_id: ID returned by submit_analysis_batch()
+            tickers: Tickers in the order they were submitted
+            data_by_ticker: Stock information keyed by ticker
+            timeout: Seconds to wait for the batch to finish
+            poll_interval: Seconds between status checks
+
+        Returns:
+            Analysis dictionaries (same shape as analyze_stock()) keyed by ticker
+
+        Example:
+            >>> analyses = agent.collect_analysis_batch(batch_id, ["AAPL", "MSFT"], data, timeout=60)
+            >>> analyses.get("AAPL")
+        """
+        batches = self.client.messages.batches
+        deadline = time.monotonic() + timeout
+
+        batch = batches.retrieve(batch_id)
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                batches.cancel(batch_id)
+                return {}
+            time.sleep(poll_interval)
+            batch = batches.retrieve(batch_id)
+
+        analyses = {}
+        for entry in batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                continue
+            ticker = tickers[int(entry.custom_id[len(_BATCH_ID_PREFIX):])]
+            message = entry.result.message
+            self._log_usage(message.usage)
+            analyses[ticker] = self._structure_analysis(
+                ticker, message.content[0].text, data_by_ticker.get(ticker, {})
+            )
+
+        return analyses
+
+    def _batch_request(
+        self,
+        tickers: List[str],
+        data_by_ticker: Dict[str, Dict[str, Any]],
+        news_by_ticker: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for a group of stock analyses."""
+        contexts = "\n\n".join(
+            f"### {ticker}\n{self._build_analysis_context(ticker, data_by_ticker.get(ticker, {}), news_by_ticker.get(ticker, []))}"
+            for ticker in tickers
+        )
+
+        return {
+            "system_prompt": self._get_system_prompt(),
+            "user_prompt": self._BATCH_PROMPT_TEMPLATE.format(contexts=contexts, tickers=", ".join(tickers)),
+            "max_tokens": 200 * len(tickers),
+            "temperature": 0.7,
+            "model": self.fast_model
+        }
+
+    @staticmethod
+    def _parse_batch_analyses(response_text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse a batch analysis JSON response into analyses keyed by ticker.
+
+        Raises:
+            ValueError: If the response does not contain the expected JSON object
+        """
+        payload = _parse_json_object(response_text)
+        return {
+            str(item.get("ticker", "")).upper(): item
+            for item in payload.get("analyses", [])
+            if isinstance(item, dict)
+        }
+
+    def _analysis_request(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for a stock analysis."""
+        # Build context from stock data and news
+        context = self._build_analysis_context(ticker, stock_data, news)
+
+        if user_question:
+            user_prompt = f"{context}\n\nUser Question: {user_question}\n\nProvide a detailed analysis addressing the user's question, in under 500 words."
+        else:
+            user_prompt = f"{context}\n\nProvide a comprehensive investment analysis for {ticker}, in under 500 words."
+
+        return {
+            "system_prompt": self._get_system_prompt(),
+            "user_prompt": user_prompt,
+            "max_tokens": 800,
+            "temperature": 0.7
+        }
+
+    def _combined_request(
+        self,
+        ticker: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]],
+        user_question: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for an analysis plus recommendation."""
+        request = self._analysis_request(ticker, stock_data, news, user_question)
+        request["user_prompt"] = self._COMBINED_PROMPT_TEMPLATE.format(analysis_prompt=request["user_prompt"])
+        request["max_tokens"] += 300
+        return request
+
+    def _parse_combined(
+        self,
+        ticker: str,
+        response_text: str,
+        stock_data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Parse a combined analysis and recommendation JSON response.
+
+        Raises:
+            ValueError: If the response does not contain the expected JSON object
+        """
+        payload = _parse_json_object(response_text)
+        analysis_text = payload.get("analysis")
+        if not isinstance(analysis_text, str) or not analysis_text:
+            raise ValueError("Response did not contain an analysis")
+
+        recommendation = str(payload.get("recommendation", "")).upper()
+        if recommendation not in ("BUY", "HOLD", "SELL"):
+            recommendation = "HOLD"
+        confidence = str(payload.get("confidence", "")).capitalize()
+        if confidence not in ("High", "Medium", "Low"):
+            confidence = "Medium"
+
+        key_points = [str(point) for point in payload.get("key_points") or []]
+        analysis = {
+            "ticker": ticker,
+            "analysis": analysis_text,
+            "key_points": key_points[:5] or ["See full analysis for details"],
+            "current_price": stock_data.get('current_price'),
+            "recommendation": recommendation
+        }
+        return analysis, {
+            "ticker": ticker,
+            "recommendation": recommendation,
+            "confidence": confidence,
+            "reasoning": str(payload.get("reasoning") or analysis_text[:200]),
+            "risks": str(payload.get("risks") or "")
+        }
+
+    def _question_request(
+        self,
+        ticker: str,
+        question: str,
+        stock_data: Dict[str, Any],
+        news: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for a question about a stock."""
+        context = self._build_analysis_context(ticker, stock_data, news)
+
+        return {
+            "system_prompt": self._get_system_prompt(),
+            "user_prompt": f"{context}\n\nQuestion: {question}\n\nProvide a clear, concise answer based on the data provided, in under 300 words.",
+            "max_tokens": 500,
+            "temperature": 0.7
+        }
+
+    def _news_summary_request(
+        self,
+        ticker: str,
+        news: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for a news summary."""
+        # Format news for the prompt
+        news_text = self._format_news_for_prompt(news)
+
+        user_prompt = self._NEWS_PROMPT_TEMPLATE.format(ticker=ticker, news_text=news_text)
+
+        return {
+            "system_prompt": self._get_system_prompt(),
+            "role_prompt": self._NEWS_ROLE_PROMPT,
+            "user_prompt": user_prompt,
+            "max_tokens": 400,
+            "temperature": 0.5,
+            "stop_sequences": self._STOP_SEQUENCES,
+            "cache_ttl": self.cache.news_ttl if self.cache else None,
+            "model": self.fast_model
+        }
+
+    def _recommendation_request(
+        self,
+        ticker: str,
+        analysis: str,
+        stock_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the completion arguments for an investment recommendation."""
+        market_cap = stock_data.get('market_cap')
+        user_prompt = self._RECOMMENDATION_PROMPT_TEMPLATE.format(
+            ticker=ticker,
+            analysis=analysis,
+            current_price=stock_data.get('current_price', 'N/A'),
+            pe_ratio=stock_data.get('pe_ratio', 'N/A'),
+            market_cap=f"${market_cap:,}" if market_cap else "N/A"
+        )
+
+        return {
+            "system_prompt": self._get_system_prompt(),
+            "role_prompt": self._RECOMMENDATION_ROLE_PROMPT,
+            "user_prompt": user_prompt,
+            "max_tokens": 300,
+            "temperature": 0.5,
+            "stop_sequences": self._STOP_SEQUENCES,
+            "model": self.fast_model
+        }
+
+    @staticmethod
+    def _news_summary_result(
+        ticker: str,
+        summary: str,
+        sentiment: str = "neutral",
+        key_points: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Shape a news summary response."""
+        return {
+            "ticker": ticker,
+            "summary": summary,
+            "sentiment": sentiment,
+            "key_points": key_points or []
+        }
+
+    @staticmethod
+    def _recommendation_error(ticker: str, error: Exception) -> Dict[str, Any]:
+        """Fallback recommendation returned when Claude cannot be reached."""
+        return {
+            "ticker": ticker,
+            "recommendation": "HOLD",
+            "confidence": "Low",
+            "reasoning": f"Error generating recommendation: {str(error)}",
+            "risks": "Unable to assess risks due to error."
+        }
+
+    def _cache_lookup(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        cache_only: bool,
+        stop_sequences: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Check the response cache before calling Claude.
+
+        With bypass_cache set, the lookup is skipped (the fresh response is
+        still stored under the returned key), except in replay mode, which
+        never calls Claude.
+
+        Returns:
+            Tuple of (cache key, cached response). The key is None when no
+            cache is configured; the response is None on a miss.
+
+        Raises:
+            CacheMiss: If no cached response exists and the cache is in replay
+                mode or cache_only is set, or if bypass_cache is set in replay mode
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = LLMCache.make_key(
+                prompt=user_prompt,
+                model=model or self.model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                stop_sequences=stop_sequences
+            )
+            if bypass_cache:
+                if self.cache.policy == "replay":
+                    raise CacheMiss("Cache is in replay mode; bypass_cache cannot call Claude")
+                cached = None
+            else:
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cache_key, cached
+
+        if cache_only:
+            raise CacheMiss("No cached response available")
+
+        return cache_key, None
+
+    def _cache_store(self, cache_key: Optional[str], response_text: str, cache_ttl: Optional[int]) -> None:
+        """Store a fresh response, defaulting to the cache's analysis TTL."""
+        if self.cache:
+            ttl = cache_ttl if cache_ttl is not None else self.cache.analysis_ttl
+            self.cache.set(cache_key, response_text, ttl)
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        role_prompt: str = "",
+        stop_sequences: Optional[List[str]] = None,
+        cache_ttl: Optional[int] = None,
+        cache_only: bool = False,
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Send a single-turn request to Claude, consulting the response cache first.
+
+        Args:
+            system_prompt: Shared system prompt, cached across requests
+            user_prompt: User message content
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            role_prompt: Optional role-specific instructions sent after the system prompt
+            stop_sequences: Optional strings that end generation early
+            cache_ttl: Seconds to cache the response (default: the cache's analysis TTL)
+            cache_only: Raise CacheMiss instead of calling the API on a cache miss
+            model: Claude model to use (default: the service's main model)
+            bypass_cache: Skip the cache lookup and call the API (the response
+                is still cached)
+
+        Returns:
+            Text of the model response
+
+        Raises:
+            CacheMiss: If no cached response exists and the cache is in replay
+                mode or cache_only is set, or if bypass_cache is set in replay mode
+        """
+        cache_key, cached = self._cache_lookup(
+            system_prompt + role_prompt, user_prompt, max_tokens, temperature,
+            cache_only=cache_only, stop_sequences=stop_sequences, model=model,
+            bypass_cache=bypass_cache
+        )
+        if cached is not None:
+            return cached
+
+        message = self.client.messages.create(
+            **self._message_params(
+                system_prompt, user_prompt, max_tokens, temperature, role_prompt, stop_sequences, model
+            )
+        )
+        self._log_usage(message.usage, model)
+        response_text = message.content[0].text
+
+        self._cache_store(cache_key, response_text, cache_ttl)
+        return response_text
+
+    async def _acomplete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        role_prompt: str = "",
+        stop_sequences: Optional[List[str]] = None,
+        cache_ttl: Optional[int] = None,
+        cache_only: bool = False,
+        model: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> str:
+        """
+        Async version of _complete() using the AsyncAnthropic client.
+
+        Args and behavior match _complete(); cache lookups are shared, so sync
+        and async callers reuse each other's responses.
+        """
+        cache_key, cached = self._cache_lookup(
+            system_prompt + role_prompt, user_prompt, max_tokens, temperature,
+            cache_only=cache_only, stop_sequences=stop_sequences, model=model,
+            bypass_cache=bypass_cache
+        )
+        if cached is not None:
+            return cached
+
+        message = await self.async_client.messages.create(
+            **self._message_params(
+                system_prompt, user_prompt, max_tokens, temperature, role_prompt, stop_sequences, model
+            )
+        )
+        self._log_usage(message.usage, model)
+        response_text = message.content[0].text
+
+        self._cache_store(cache_key, response_text, cache_ttl)
+        return response_text
+
+    async def _astream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        role_prompt: str = "",
+        stop_sequences: Optional[List[str]] = None,
+        cache_ttl: Optional[int] = None,
+        model: Optional[str] = None,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Streaming version of _acomplete(), yielding text as it arrives.
+
+        A cached response is yielded as a single chunk. The full text is
+        cached once the stream completes, so later calls share it.
+
+        Raises:
+            CacheMiss: See _cache_lookup()
+        """
+        cache_key, cached = self._cache_lookup(
+            system_prompt + role_prompt, user_prompt, max_tokens, temperature,
+            cache_only=cache_only, stop_sequences=stop_sequences, model=model,
+            bypass_cache=bypass_cache
+        )
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async with self.async_client.messages.stream(
+            **self._message_params(
+                system_prompt, user_prompt, max_tokens, temperature, role_prompt, stop_sequences, model
+            )
+        ) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                yield text
+            self._log_usage((await stream.get_final_message()).usage, model)
+
+        self._cache_store(cache_key, "".join(chunks), cache_ttl)
+
+    def _log_usage(self, usage: Any, model: Optional[str] = None) -> None:
+        """Log token usage, including prompt cache reads and writes, for a response."""
+        logger.info(
+            "Claude usage (%s): input=%s output=%s cache_read=%s cache_write=%s",
+            model or self.model,
+            usage.input_tokens,
+            usage.output_tokens,
+            getattr(usage, "cache_read_input_tokens", None) or 0,
+            getattr(usage, "cache_creation_input_tokens", None) or 0,
+        )
+
+    def _message_params(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        role_prompt: str = "",
+        stop_sequences: Optional[List[str]] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the Messages API parameters shared by live and batched requests."""
+        params = {
+            "model": model or self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": self._system_blocks(system_prompt, role_prompt),
+            "messages": [
+                {"role": "user", "content": user_prompt}
+            ]
+        }
+        if stop_sequences:
+            params["stop_sequences"] = stop_sequences
+        return params
+
+    @staticmethod
+    def _system_blocks(system_prompt: str, role_prompt: str = "") -> List[Dict[str, Any]]:
+        """
+        Build the system content blocks for a request.
+
+        The shared system prompt comes first and the role prompt follows it.
+        Neither carries a prompt cache breakpoint: the system prompt is far
+        below the minimum cacheable prefix (1024 tokens for Sonnet, 2048 for
+        Haiku), so the API would ignore it.
+
+        Args:
+            system_prompt: Shared system prompt text
+            role_prompt: Optional role-specific instructions
+
+        Returns:
+            System content blocks for messages.create()
+        """
+        blocks = [{"type": "text", "text": system_prompt}]
+        if role_prompt:
+            blocks.append({"type": "text", "text": role_prompt})
+        return blocks
+
+    def _get_system_prompt(self) -> str:
+        """Get the system prompt for the AI agent."""
+        return self._SYSTEM_PROMPT
 
     def _build_analysis_context(
         self,
@@ -304,57 +1343,77 @@ Always base your analysis on the provided data and clearly state when you're mak
         news: List[Dict[str, Any]]
     ) -> str:
         """Build context string from stock data and news."""
-        context_parts = [f"Stock Analysis for {ticker} ({stock_data.get('name', 'N/A')})\n"]
-
-        # Basic info
-        context_parts.append(f"\nCurrent Price: ${stock_data.get('current_price', 'N/A')}")
-        context_parts.append(f"Market Cap: ${stock_data.get('market_cap', 'N/A'):,}" if stock_data.get('market_cap') else "Market Cap: N/A")
-        context_parts.append(f"Sector: {stock_data.get('sector', 'N/A')}")
-        context_parts.append(f"Industry: {stock_data.get('industry', 'N/A')}")
-
-        # Valuation metrics
-        context_parts.append("\n\nValuation Metrics:")
-        context_parts.append(f"- P/E Ratio: {stock_data.get('pe_ratio', 'N/A')}")
-        context_parts.append(f"- Forward P/E: {stock_data.get('forward_pe', 'N/A')}")
-        context_parts.append(f"- Beta: {stock_data.get('beta', 'N/A')}")
-
-        # Profitability
-        context_parts.append("\n\nProfitability:")
-        profit_margin = stock_data.get('profit_margins')
-        context_parts.append(f"- Profit Margin: {profit_margin*100:.2f}%" if profit_margin else "- Profit Margin: N/A")
-        operating_margin = stock_data.get('operating_margins')
-        context_parts.append(f"- Operating Margin: {operating_margin*100:.2f}%" if operating_margin else "- Operating Margin: N/A")
-        roe = stock_data.get('return_on_equity')
-        context_parts.append(f"- ROE: {roe*100:.2f}%" if roe else "- ROE: N/A")
-
-        # Growth
-        context_parts.append("\n\nGrowth:")
-        earnings_growth = stock_data.get('earnings_growth')
-        context_parts.append(f"- Earnings Growth: {earnings_growth*100:.2f}%" if earnings_growth else "- Earnings Growth: N/A")
-        revenue_growth = stock_data.get('revenue_growth')
-        context_parts.append(f"- Revenue Growth: {revenue_growth*100:.2f}%" if revenue_growth else "- Revenue Growth: N/A")
+        values = _NotAvailable(stock_data)
+        values["ticker"] = ticker
+
+        get = stock_data.get
+        format_percent = self._format_percent
+
+        market_cap = get('market_cap')
+        values["market_cap_display"] = f"${market_cap:,}" if market_cap else "N/A"
+        for field in ("profit_margins", "operating_margins", "return_on_equity", "earnings_growth", "revenue_growth"):
+            values[f"{field}_display"] = format_percent(get(field))
+
+        context = self._CONTEXT_TEMPLATE.format_map(values)
 
         # Recent news
-        if news:
-            context_parts.append("\n\nRecent News:")
-            for i, article in enumerate(news[:5], 1):
-                context_parts.append(f"\n{i}. {article.get('title', '')}")
-                context_parts.append(f"   Source: {article.get('source', 'Unknown')} | Sentiment: {article.get('sentiment', 'neutral')}")
-                if article.get('description'):
-                    context_parts.append(f"   {article['description'][:150]}...")
+        if not news:
+            return context
+
+        return context + "\n\n\nRecent News:" + "".join(
+            f"\n\n{i}. {article['title']}"
+            f"\n   {article['date']} | Source: {article['source']} | Sentiment: {article['sentiment']}"
+            + (f"\n   {article['summary']}" if article['summary'] else "")
+            for i, article in enumerate(self._compact_news(news, k=5, max_summary_chars=150), 1)
+        )
 
-        return "\n".join(context_parts)
+    @staticmethod
+    def _format_percent(value: Optional[float]) -> str:
+        """Format a ratio as a percentage, or 'N/A' when missing or zero."""
+        return f"{value*100:.2f}%" if value else "N/A"
 
     def _format_news_for_prompt(self, news: List[Dict[str, Any]]) -> str:
         """Format news articles for prompt."""
-        formatted = []
-        for i, article in enumerate(news[:10], 1):
-            formatted.append(f"{i}. {article.get('title', '')}")
-            if article.get('description'):
-                formatted.append(f"   {article['description']}")
-            formatted.append(f"   Source: {article.get('source', 'Unknown')}")
-            formatted.append("")
-        return "\n".join(formatted)
+        return "\n".join(
+            f"{i}. {article['title']}\n"
+            + (f"   {article['summary']}\n" if article['summary'] else "")
+            + f"   {article['date']} | Source: {article['source']}\n"
+            for i, article in enumerate(self._compact_news(news, k=10), 1)
+        )
+
+    @staticmethod
+    def _compact_news(
+        news: List[Dict[str, Any]],
+        k: int = 5,
+        max_summary_chars: int = 280
+    ) -> List[Dict[str, str]]:
+        """
+        Reduce articles to the fields the prompts use, keeping the k most recent.
+
+        Titles are cut to 120 characters and descriptions to max_summary_chars,
+        so long articles do not inflate input tokens.
+
+        Args:
+            news: Articles from the news service
+            k: Maximum number of articles to keep
+            max_summary_chars: Maximum description length
+
+        Returns:
+            Compact articles (title, summary, date, source, sentiment), newest first
+        """
+        compact = []
+        for article in nlargest(k, news, key=lambda article: article.get('published_at') or ""):
+            summary = article.get('description') or ""
+            if len(summary) > max_summary_chars:
+                summary = summary[:max_summary_chars].rstrip() + "..."
+            compact.append({
+                "title": (article.get('title') or "")[:120],
+                "summary": summary,
+                "date": (article.get('published_at') or "")[:10],
+                "source": article.get('source') or "Unknown",
+                "sentiment": article.get('sentiment') or "neutral",
+            })
+        return compact
 
     def _structure_analysis(
         self,
@@ -364,17 +1423,12 @@ Always base your analysis on the provided data and clearly state when you're mak
     ) -> Dict[str, Any]:
         """Structure the analysis response."""
         # Extract key points (look for bullet points or numbered lists)
-        key_points = []
-        lines = analysis_text.split("\n")
-        for line in lines:
-            line = line.strip()
-            if line.startswith(("-", "•", "*")) or (line and line[0].isdigit() and ". " in line):
-                key_points.append(line.lstrip("-•*0123456789. "))
+        key_points = [match.group(1) for match in islice(_KEY_POINT_RE.finditer(analysis_text), 5)]
 
         return {
             "ticker": ticker,
             "analysis": analysis_text,
-            "key_points": key_points[:5] if key_points else ["See full analysis for details"],
+            "key_points": key_points or ["See full analysis for details"],
             "current_price": stock_data.get('current_price'),
             "recommendation": None  # Will be set separately if needed
         }
@@ -387,21 +1441,23 @@ Always base your analysis on the provided data and clearly state when you're mak
             "key_points": []
         }
 
-        lines = response_text.split("\n")
-        current_section = None
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("SUMMARY:"):
-                result["summary"] = line.replace("SUMMARY:", "").strip()
-            elif line.startswith("SENTIMENT:"):
-                sentiment = line.replace("SENTIMENT:", "").strip().lower()
-                if sentiment in ["positive", "negative", "neutral"]:
-                    result["sentiment"] = sentiment
-            elif line.startswith("KEY POINTS:"):
-                current_section = "key_points"
-            elif current_section == "key_points" and line.startswith("-"):
-                result["key_points"].append(line.lstrip("- "))
+        key_points_start = None
+        for match in _NEWS_FIELD_RE.finditer(response_text):
+            label, value = match.group(1), match.group(2).strip()
+            if label == "SUMMARY":
+                result["summary"] = value
+            elif label == "SENTIMENT":
+                if value.lower() in ["positive", "negative", "neutral"]:
+                    result["sentiment"] = value.lower()
+            elif key_points_start is None:
+                key_points_start = match.end()
+
+        # Every dash bullet after the KEY POINTS header is a key point
+        if key_points_start is not None:
+            result["key_points"] = [
+                bullet.rstrip().lstrip("- ")
+                for bullet in _DASH_BULLET_RE.findall(response_text, key_points_start)
+            ]
 
         # Fallback if parsing failed
         if not result["summary"]:
@@ -418,22 +1474,18 @@ Always base your analysis on the provided data and clearly state when you're mak
             "risks": ""
         }
 
-        lines = response_text.split("\n")
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("RECOMMENDATION:"):
-                rec = line.replace("RECOMMENDATION:", "").strip().upper()
-                if rec in ["BUY", "HOLD", "SELL"]:
-                    result["recommendation"] = rec
-            elif line.startswith("CONFIDENCE:"):
-                conf = line.replace("CONFIDENCE:", "").strip()
-                if conf in ["High", "Medium", "Low"]:
-                    result["confidence"] = conf
-            elif line.startswith("REASONING:"):
-                result["reasoning"] = line.replace("REASONING:", "").strip()
-            elif line.startswith("RISKS:"):
-                result["risks"] = line.replace("RISKS:", "").strip()
+        for match in _RECOMMENDATION_FIELD_RE.finditer(response_text):
+            label, value = match.group(1), match.group(2).strip()
+            if label == "RECOMMENDATION":
+                if value.upper() in ["BUY", "HOLD", "SELL"]:
+                    result["recommendation"] = value.upper()
+            elif label == "CONFIDENCE":
+                if value in ["High", "Medium", "Low"]:
+                    result["confidence"] = value
+            elif label == "REASONING":
+                result["reasoning"] = value
+            else:
+                result["risks"] = value
 
         # Fallback
         if not result["reasoning"]:
@@ -0,0 +1,86 @@
+"""In-memory TTL caching for market data lookups."""
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, List, Tuple
+import pandas as pd
+from cachetools import TTLCache
+
+
+# Every cache created by ttl_cache(), so clear_cache() can reset them all
+_registry: List[Tuple[TTLCache, threading.Lock]] = []
+_registry_lock = threading.Lock()
+
+
+def _clone(value: Any) -> Any:
+    """Copy a cached value so callers cannot mutate the stored entry."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def ttl_cache(ttl: int, maxsize: int = 256) -> Callable:
+    """
+    Cache a function's results per ticker and arguments for a limited time.
+
+    The first positional argument is treated as a ticker symbol and
+    upper-cased, and defaults are filled in so that get(t) and
+    get(t, period="1mo") share an entry. Exceptions are never cached, and
+    hits return a copy of the stored value.
+
+    Args:
+        ttl: Seconds to keep each result
+        maxsize: Maximum number of cached results
+
+    Returns:
+        Decorator that wraps the function with the cache
+
+    Example:
+        >>> @ttl_cache(ttl=60)
+        ... def get_quote(ticker): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        lock = threading.Lock()
+        signature = inspect.signature(func)
+
+        with _registry_lock:
+            _registry.append((cache, lock))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            values = list(bound.arguments.values())
+            if values and isinstance(values[0], str):
+                values[0] = values[0].upper()
+            key = tuple(values)
+
+            with lock:
+                value = cache.get(key)
+            if value is not None:
+                return _clone(value)
+
+            value = func(*args, **kwargs)
+            with lock:
+                cache[key] = value
+            return _clone(value)
+
+        wrapper.cache_clear = lambda: _clear(cache, lock)
+        return wrapper
+
+    return decorator
+
+
+def _clear(cache: TTLCache, lock: threading.Lock) -> None:
+    with lock:
+        cache.clear()
+
+
+def clear_cache() -> None:
+    """Drop every entry from all caches created by ttl_cache()."""
+    with _registry_lock:
+        caches = list(_registry)
+    for cache, lock in caches:
+        _clear(cache, lock)
@@ -0,0 +1,162 @@
+"""Response cache for Claude API calls."""
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+from cachetools import TLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_POLICIES = ("enabled", "read_only", "replay", "disabled")
+
+
+class CacheMiss(Exception):
+    """Raised when a cached response is required but not available."""
+
+
+class LLMCache:
+    """
+    In-process cache of Claude responses keyed by a SHA256 of the request.
+
+    Supported policies:
+        - enabled: serve cached responses and store new ones
+        - read_only: serve cached responses but never store new ones
+        - replay: only serve cached responses; a miss raises CacheMiss
+        - disabled: bypass the cache entirely
+    """
+
+    def __init__(
+        self,
+        policy: str = "enabled",
+        maxsize: int = 1024,
+        analysis_ttl: int = 900,
+        news_ttl: int = 3600
+    ):
+        """
+        Initialize the LLM response cache.
+
+        Args:
+            policy: Cache policy (enabled, read_only, replay, disabled)
+            maxsize: Maximum number of cached responses
+            analysis_ttl: Seconds to keep analysis responses
+            news_ttl: Seconds to keep news summary responses
+
+        Raises:
+            ValueError: If the policy is not supported
+        """
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                f"Unsupported cache policy '{policy}' (expected one of: {', '.join(CACHE_POLICIES)})"
+            )
+
+        self.policy = policy
+        self.analysis_ttl = analysis_ttl
+        self.news_ttl = news_ttl
+        # Each entry stores (value, ttl) so responses can expire at different rates
+        self._cache: TLRUCache = TLRUCache(maxsize=maxsize, ttu=lambda _key, value, now: now + value[1])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system: str = "",
+        provider: str = "anthropic",
+        stop_sequences: Optional[Sequence[str]] = None
+    ) -> str:
+        """
+        Build the cache key for a completion request.
+
+        Args:
+            prompt: User prompt sent to the model
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            system: System prompt sent to the model
+            provider: LLM provider name
+            stop_sequences: Strings that end generation early, if any
+
+        Returns:
+            Hex-encoded SHA256 digest of the request parameters
+        """
+        raw = f"{system}|{prompt}|{model}|{provider}|{temperature}|{max_tokens}"
+        if stop_sequences:
+            raw += "|" + "|".join(stop_sequences)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on a miss
+
+        Raises:
+            CacheMiss: If the policy is 'replay' and the response is not cached
+        """
+        if self.policy == "disabled":
+            return None
+
+        with self._lock:
+            entry: Optional[Tuple[str, int]] = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        logger.debug("LLM cache %s for key %s", "miss" if entry is None else "hit", key[:12])
+
+        if entry is None:
+            if self.policy == "replay":
+                raise CacheMiss(f"No cached response for key {key[:12]}")
+            return None
+
+        return entry[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        """
+        Store a response if the policy allows writes.
+
+        Args:
+            key: Cache key from make_key()
+            value: Response text to cache
+            ttl: Seconds to keep the response
+        """
+        if self.policy != "enabled" or ttl <= 0:
+            return
+
+        with self._lock:
+            self._cache[key] = (value, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness since startup.
+
+        Returns:
+            Dictionary with the policy, hit and miss counts, hit rate and
+            number of cached responses
+        """
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._cache)
+
+        lookups = hits + misses
+        return {
+            "policy": self.policy,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "size": size
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._cache.clear()
@@ -1,18 +1,231 @@
 """News fetching service using Finnhub API."""
+import asyncio
+import copy
+import random
+import re
+import threading
+import time
 import finnhub
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from backend.services.rate_limit import TokenBucket
+
+# Maximum concurrent Finnhub requests for batch fetches
+BATCH_MAX_WORKERS = 8
+
+# Finnhub retries on rate limits and server errors, with exponential backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Finnhub free tier quota per API key, and the largest burst sent at once
+FINNHUB_RATE_LIMIT = 60
+FINNHUB_RATE_PERIOD = 60.0
+FINNHUB_BURST = 10
+
+# Maximum in-flight Finnhub requests from the *_async methods
+ASYNC_MAX_CONCURRENCY = 10
+
+# Header carrying the API key, so it never appears in request URLs (logs, error text)
+FINNHUB_TOKEN_HEADER = "X-Finnhub-Token"
+
+# Seconds to reuse a computed sentiment summary (never longer than the news cache)
+SENTIMENT_CACHE_TTL = 120
+
+POSITIVE_KEYWORDS = [
+    "surge", "soar", "rally", "gain", "profit", "beat", "upgrade",
+    "bullish", "growth", "strong", "outperform", "success", "record",
+    "high", "jump", "rise", "climbs", "boost", "positive"
+]
+NEGATIVE_KEYWORDS = [
+    "fall", "drop", "plunge", "loss", "miss", "downgrade", "bearish",
+    "decline", "weak", "concern", "risk", "cut", "underperform", "low",
+    "tumble", "sink", "crash", "slump", "negative", "disappointing"
+]
+
+
+@dataclass(slots=True, frozen=True)
+class ArticleRecord:
+    """Parsed Finnhub company news article, as kept in the news cache."""
+
+    title: str
+    description: str
+    url: str
+    published_at: str
+    source: str
+    category: str
+    image: str
+    related: Optional[str]
+    sentiment: str
+
+    def to_dict(self, ticker: str) -> Dict[str, Any]:
+        """Build the article dictionary returned by the service."""
+        return {
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "published_at": self.published_at,
+            "source": self.source,
+            "category": self.category,
+            "image": self.image,
+            "related_tickers": ticker if self.related is None else self.related,
+            "sentiment": self.sentiment,
+        }
+
+
+# Process-wide Finnhub clients and rate limiters keyed by API key (the key lives on the session)
+_clients: Dict[str, finnhub.Client] = {}
+_rate_limiters: Dict[str, TokenBucket] = {}
+_clients_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str) -> TokenBucket:
+    """
+    Get the shared Finnhub rate limiter for an API key, creating it on first use.
+
+    Finnhub enforces its quota per key, so every service and thread using the
+    same key draws from one bucket.
+
+    Args:
+        api_key: Finnhub API key
+
+    Returns:
+        Token bucket shared by all callers with the same key
+    """
+    with _clients_lock:
+        limiter = _rate_limiters.get(api_key)
+        if limiter is None:
+            limiter = _rate_limiters[api_key] = TokenBucket(
+                rate=FINNHUB_RATE_LIMIT, per=FINNHUB_RATE_PERIOD, capacity=FINNHUB_BURST
+            )
+        return limiter
+
+
+def get_client(api_key: str) -> finnhub.Client:
+    """
+    Get the shared Finnhub client for an API key, creating it on first use.
+
+    The client's requests.Session is mounted with a larger connection pool so
+    concurrent fetches reuse keep-alive connections instead of reconnecting,
+    and retries rate-limited (429) and 5xx responses with exponential backoff.
+    Every response's quota headers are fed to the key's rate limiter. The API
+    key is sent in the X-Finnhub-Token header rather than the query string.
+
+    Args:
+        api_key: Finnhub API key
+
+    Returns:
+        Finnhub client reused by all callers with the same key
+    """
+    limiter = get_rate_limiter(api_key)
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = finnhub.Client(api_key=api_key)
+            client._session.params.pop("token", None)
+            client._session.headers[FINNHUB_TOKEN_HEADER] = api_key
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=["GET"],
+                raise_on_status=False
+            )
+            client._session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+            )
+            client._session.hooks["response"].append(
+                lambda response, *args, **kwargs: limiter.update_from_headers(response.headers)
+            )
+        return client
+
+
+def _describe_error(error: Exception) -> str:
+    """Describe a failed Finnhub request without echoing URLs, headers or raw error text."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"Finnhub returned HTTP {error.response.status_code}"
+    if isinstance(error, finnhub.FinnhubAPIException):
+        return f"Finnhub returned HTTP {error.status_code}"
+    if isinstance(error, (httpx.RequestError, requests.RequestException)):
+        return "Could not reach Finnhub"
+    return "Unexpected response from Finnhub"
+
+
+# Default news window as (computed_at, from_date, to_date), recomputed at most once per second
+_date_window: Tuple[float, str, str] = (float("-inf"), "", "")
+
+
+def default_date_range(from_date: Optional[str], to_date: Optional[str]) -> Tuple[str, str]:
+    """
+    Fill in missing dates with the last 7 days (UTC).
+
+    Shared by the routes and the service, so default requests always use the
+    same (ticker, from, to) news cache key.
+
+    Args:
+        from_date: Start date in YYYY-MM-DD format, or None
+        to_date: End date in YYYY-MM-DD format, or None
+
+    Returns:
+        Tuple of (from_date, to_date)
+    """
+    global _date_window
+    if from_date and to_date:
+        return from_date, to_date
+
+    computed_at, default_from, default_to = _date_window
+    now = time.monotonic()
+    if now - computed_at > 1.0:
+        today = datetime.now(timezone.utc)
+        default_from = (today - timedelta(days=7)).strftime("%Y-%m-%d")
+        default_to = today.strftime("%Y-%m-%d")
+        _date_window = (now, default_from, default_to)
+    return from_date or default_from, to_date or default_to
+
+
+@lru_cache(maxsize=4096)
+def _iso_timestamp(timestamp: float) -> str:
+    """Convert a Unix timestamp to a local ISO 8601 string."""
+    if isinstance(timestamp, int):
+        return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp))
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile keywords into one case-insensitive scan that also finds overlapping matches."""
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))", re.IGNORECASE)
+
+
+_POSITIVE_RE = _keyword_pattern(POSITIVE_KEYWORDS)
+_NEGATIVE_RE = _keyword_pattern(NEGATIVE_KEYWORDS)
 
 
 class NewsService:
     """Service for fetching financial news and sentiment data using Finnhub."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache_ttl: int = 300
+    ):
         """
         Initialize news service.
 
         Args:
             api_key: Finnhub API key (required)
+            http_client: Optional shared async HTTP client used by the *_async methods
+            cache_ttl: Seconds to reuse a Finnhub company news response (0 disables)
 
         Raises:
             ValueError: If API key is not provided
@@ -21,7 +234,19 @@ class NewsService:
             raise ValueError("Finnhub API key is required")
 
         self.api_key = api_key
-        self.client = finnhub.Client(api_key=api_key)
+        self.client = get_client(api_key)
+        self.rate_limiter = get_rate_limiter(api_key)
+        self.http_client = http_client
+        self._async_semaphore = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Raw company news keyed by (ticker, from_date, to_date)
+        self._news_cache: Optional[TTLCache] = TTLCache(maxsize=1024, ttl=cache_ttl) if cache_ttl > 0 else None
+        # Sentiment summaries under the same keys, expiring no later than the news they summarize
+        self._sentiment_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=1024, ttl=min(cache_ttl, SENTIMENT_CACHE_TTL)) if cache_ttl > 0 else None
+        )
+        self._news_cache_lock = threading.Lock()
 
     def get_company_news(
         self,
@@ -46,34 +271,273 @@ class NewsService:
             >>> service = NewsService("your_api_key")
             >>> news = service.get_company_news("AAPL", from_date="2024-01-01", to_date="2024-01-31")
         """
+        articles = self._fetch_company_news(ticker, from_date, to_date)
+        return self._format_company_news(articles, ticker, limit)
+
+    def _fetch_company_news(
+        self,
+        ticker: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ) -> List[ArticleRecord]:
+        """
+        Fetch and parse Finnhub company news, using the response cache.
+
+        Raises:
+            ValueError: If the Finnhub request fails
+        """
         # Set default dates if not provided
-        if not to_date:
-            to_date = datetime.now().strftime("%Y-%m-%d")
-        if not from_date:
-            from_date = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+        from_date, to_date = default_date_range(from_date, to_date)
+
+        key = (ticker.upper(), from_date, to_date)
+        articles = self._cached_news(key)
+        if articles is not None:
+            return articles
 
         try:
-            articles = self.client.company_news(ticker.upper(), _from=from_date, to=to_date)
+            self.rate_limiter.acquire()
+            articles = self._parse_company_news(
+                self.client.company_news(ticker.upper(), _from=from_date, to=to_date)
+            )
+            self._store_news(key, articles)
+            return articles
 
-            # Format the response
-            formatted_articles = []
-            for article in articles[:limit]:
-                formatted_articles.append({
-                    "title": article.get("headline", ""),
-                    "description": article.get("summary", ""),
-                    "url": article.get("url", ""),
-                    "published_at": datetime.fromtimestamp(article.get("datetime", 0)).isoformat(),
-                    "source": article.get("source", "Unknown"),
-                    "category": article.get("category", "general"),
-                    "image": article.get("image", ""),
-                    "related_tickers": article.get("related", ticker),
-                    "sentiment": self._extract_sentiment(article),
-                })
+        except Exception as e:
+            raise ValueError(f"Error fetching news for {ticker}: {_describe_error(e)}")
 
-            return formatted_articles
+    async def get_company_news_async(
+        self,
+        ticker: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch news articles for a company without blocking the event loop.
+
+        Uses the shared async HTTP client (pooled HTTP/2 connections) when one
+        was provided, otherwise runs get_company_news() in a worker thread.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., 'AAPL')
+            from_date: Start date in YYYY-MM-DD format (default: 7 days ago)
+            to_date: End date in YYYY-MM-DD format (default: today)
+            limit: Maximum number of articles to return
+
+        Returns:
+            List of news articles with metadata
+
+        Example:
+            >>> service = NewsService("your_api_key", http_client=httpx.AsyncClient(http2=True))
+            >>> news = await service.get_company_news_async("AAPL")
+        """
+        articles = await self._fetch_company_news_async(ticker, from_date, to_date)
+        return self._format_company_news(articles, ticker, limit)
+
+    async def _fetch_company_news_async(
+        self,
+        ticker: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None
+    ) -> List[ArticleRecord]:
+        """
+        Async version of _fetch_company_news(), sharing its response cache.
+
+        Raises:
+            ValueError: If the Finnhub request fails
+        """
+        if self.http_client is None:
+            return await asyncio.to_thread(self._fetch_company_news, ticker, from_date, to_date)
+
+        # Set default dates if not provided
+        from_date, to_date = default_date_range(from_date, to_date)
+
+        key = (ticker.upper(), from_date, to_date)
+        articles = self._cached_news(key)
+        if articles is not None:
+            return articles
+
+        try:
+            response = await self._get_with_retry(
+                f"{finnhub.Client.API_URL}/company-news",
+                params={"symbol": ticker.upper(), "from": from_date, "to": to_date},
+                headers={FINNHUB_TOKEN_HEADER: self.api_key}
+            )
+            response.raise_for_status()
+            articles = self._parse_company_news(response.json())
+            self._store_news(key, articles)
+            return articles
 
         except Exception as e:
-            raise ValueError(f"Error fetching news for {ticker}: {str(e)}")
+            raise ValueError(f"Error fetching news for {ticker}: {_describe_error(e)}")
+
+    async def _get_with_retry(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        GET with the shared async client, retrying transient failures.
+
+        Each attempt waits for the rate limiter and at most
+        ASYNC_MAX_CONCURRENCY requests are in flight at once. Rate-limited (429)
+        and 5xx responses and transport errors are retried up to MAX_RETRIES
+        times with jittered exponential backoff; the last response (or error)
+        is returned to the caller.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self._async_semaphore:
+                    await self.rate_limiter.acquire_async()
+                    response = await self.http_client.get(url, params=params, headers=headers)
+                self.rate_limiter.update_from_headers(response.headers)
+            except httpx.TransportError:
+                if attempt == MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response
+
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def get_company_news_batch(
+        self,
+        tickers: List[str],
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch news for several companies concurrently.
+
+        Requests run on a thread pool owned by the service, so total latency is
+        bounded by the slowest ticker rather than the sum of all of them.
+
+        Args:
+            tickers: Stock ticker symbols
+            from_date: Start date in YYYY-MM-DD format (default: 7 days ago)
+            to_date: End date in YYYY-MM-DD format (default: today)
+            limit: Maximum number of articles to return per ticker
+
+        Returns:
+            Dictionary mapping each ticker (in input order) to its articles.
+            Tickers whose fetch failed are omitted.
+
+        Example:
+            >>> service = NewsService("your_api_key")
+            >>> news = service.get_company_news_batch(["AAPL", "MSFT", "GOOGL"])
+            >>> news["MSFT"][0]["title"]
+        """
+        # Resolve default dates once so every ticker covers the same window
+        from_date, to_date = default_date_range(from_date, to_date)
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self.get_company_news, ticker, from_date, to_date, limit): ticker
+            for ticker in tickers
+        }
+
+        fetched: Dict[str, List[Dict[str, Any]]] = {}
+        for future in as_completed(futures):
+            try:
+                fetched[futures[future]] = future.result()
+            except ValueError:
+                continue
+
+        return {ticker: fetched[ticker] for ticker in tickers if ticker in fetched}
+
+    async def get_company_news_batch_async(
+        self,
+        tickers: List[str],
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Async wrapper around get_company_news_batch() for use from the event loop.
+
+        Example:
+            >>> news = await service.get_company_news_batch_async(["AAPL", "MSFT"])
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.get_company_news_batch, tickers, from_date, to_date, limit
+        )
+
+    def close(self) -> None:
+        """Shut down the batch thread pool, if it was started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the batch thread pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=BATCH_MAX_WORKERS,
+                    thread_name_prefix="finnhub"
+                )
+            return self._executor
+
+    def _cached_news(self, key: Tuple[str, str, str]) -> Optional[List[ArticleRecord]]:
+        """Get cached company news, or None on a miss."""
+        if self._news_cache is None:
+            return None
+        with self._news_cache_lock:
+            return self._news_cache.get(key)
+
+    def _store_news(self, key: Tuple[str, str, str], articles: List[ArticleRecord]) -> None:
+        """Cache parsed company news."""
+        if self._news_cache is None:
+            return
+        with self._news_cache_lock:
+            self._news_cache[key] = articles
+
+    def _parse_company_news(self, articles: List[Dict[str, Any]]) -> List[ArticleRecord]:
+        """Parse a raw Finnhub company news response, tagging each article's sentiment."""
+        extract_sentiment = self._extract_sentiment
+        records = []
+        append = records.append
+        for article in articles:
+            get = article.get
+            append(ArticleRecord(
+                title=get("headline", ""),
+                description=get("summary", ""),
+                url=get("url", ""),
+                published_at=_iso_timestamp(get("datetime", 0)),
+                source=get("source", "Unknown"),
+                category=get("category", "general"),
+                image=get("image", ""),
+                related=get("related"),
+                sentiment=extract_sentiment(article),
+            ))
+
+        return records
+
+    def _format_company_news(
+        self,
+        articles: List[ArticleRecord],
+        ticker: str,
+        limit: int,
+        sentiment_counts: Optional[Counter] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Format parsed company news into article dictionaries.
+
+        When sentiment_counts is given, each article's sentiment label is
+        tallied into it in the same pass.
+        """
+        formatted_articles = []
+        append = formatted_articles.append
+        for article in articles[:limit]:
+            if sentiment_counts is not None:
+                sentiment_counts[article.sentiment] += 1
+            append(article.to_dict(ticker))
+
+        return formatted_articles
 
     def get_market_news(
         self,
@@ -95,24 +559,43 @@ class NewsService:
             >>> news = service.get_market_news(category="general")
         """
         try:
+            self.rate_limiter.acquire()
             articles = self.client.general_news(category, min_id=0)
 
             formatted_articles = []
+            append = formatted_articles.append
             for article in articles[:limit]:
-                formatted_articles.append({
-                    "title": article.get("headline", ""),
-                    "description": article.get("summary", ""),
-                    "url": article.get("url", ""),
-                    "published_at": datetime.fromtimestamp(article.get("datetime", 0)).isoformat(),
-                    "source": article.get("source", "Unknown"),
-                    "category": article.get("category", category),
-                    "image": article.get("image", ""),
+                get = article.get
+                append({
+                    "title": get("headline", ""),
+                    "description": get("summary", ""),
+                    "url": get("url", ""),
+                    "published_at": _iso_timestamp(get("datetime", 0)),
+                    "source": get("source", "Unknown"),
+                    "category": get("category", category),
+                    "image": get("image", ""),
                 })
 
             return formatted_articles
 
         except Exception as e:
-            raise ValueError(f"Error fetching market news: {str(e)}")
+            raise ValueError(f"Error fetching market news: {_describe_error(e)}")
+
+    async def get_market_news_async(
+        self,
+        category: str = "general",
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Async wrapper around get_market_news() for use from the event loop.
+
+        Runs in a worker thread, so waiting on the rate limiter never blocks
+        the event loop.
+
+        Example:
+            >>> news = await service.get_market_news_async(category="general")
+        """
+        return await asyncio.to_thread(self.get_market_news, category, limit)
 
     def get_news_sentiment(self, ticker: str) -> Dict[str, Any]:
         """
@@ -128,8 +611,65 @@ class NewsService:
             >>> service = NewsService("your_api_key")
             >>> sentiment = service.get_news_sentiment("AAPL")
         """
-        # Get recent news (last 7 days)
-        news = self.get_company_news(ticker, limit=10)
+        key = self._sentiment_key(ticker)
+        cached = self._cached_sentiment(key, ticker)
+        if cached is not None:
+            return cached
+
+        result = self._news_sentiment(ticker, self._fetch_company_news(ticker))
+        self._store_sentiment(key, result)
+        return result
+
+    async def get_news_sentiment_async(self, ticker: str) -> Dict[str, Any]:
+        """
+        Async version of get_news_sentiment() that does not block the event loop.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Dictionary with sentiment analysis and recent news
+
+        Example:
+            >>> service = NewsService("your_api_key", http_client=httpx.AsyncClient(http2=True))
+            >>> sentiment = await service.get_news_sentiment_async("AAPL")
+        """
+        key = self._sentiment_key(ticker)
+        cached = self._cached_sentiment(key, ticker)
+        if cached is not None:
+            return cached
+
+        result = self._news_sentiment(ticker, await self._fetch_company_news_async(ticker))
+        self._store_sentiment(key, result)
+        return result
+
+    @staticmethod
+    def _sentiment_key(ticker: str) -> Tuple[str, str, str]:
+        """Cache key for a sentiment summary; matches the key of the news it summarizes."""
+        return (ticker.upper(), *default_date_range(None, None))
+
+    def _cached_sentiment(self, key: Tuple[str, str, str], ticker: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached sentiment summary, or None on a miss."""
+        if self._sentiment_cache is None:
+            return None
+        with self._news_cache_lock:
+            cached = self._sentiment_cache.get(key)
+        if cached is None:
+            return None
+        return {**copy.deepcopy(cached), "ticker": ticker}
+
+    def _store_sentiment(self, key: Tuple[str, str, str], result: Dict[str, Any]) -> None:
+        """Cache a copy of a sentiment summary, so callers can modify theirs."""
+        if self._sentiment_cache is None:
+            return
+        with self._news_cache_lock:
+            self._sentiment_cache[key] = copy.deepcopy(result)
+
+    def _news_sentiment(self, ticker: str, articles: List[ArticleRecord]) -> Dict[str, Any]:
+        """Build the sentiment summary for a ticker's recent (last 7 days) articles."""
+        # Tag and count sentiment in one pass
+        counts: Counter = Counter()
+        news = self._format_company_news(articles, ticker, 10, counts)
 
         if not news:
             return {
@@ -144,7 +684,7 @@ class NewsService:
             }
 
         # Calculate sentiment summary
-        sentiment_summary = self._calculate_sentiment_summary(news)
+        sentiment_summary = self._summarize_sentiment_counts(counts, len(news))
 
         return {
             "ticker": ticker,
@@ -167,21 +707,11 @@ class NewsService:
         Returns:
             Sentiment classification: 'positive', 'negative', or 'neutral'
         """
-        text = f"{article.get('headline', '')} {article.get('summary', '')}".lower()
+        text = f"{article.get('headline', '')} {article.get('summary', '')}"
 
-        positive_keywords = [
-            "surge", "soar", "rally", "gain", "profit", "beat", "upgrade",
-            "bullish", "growth", "strong", "outperform", "success", "record",
-            "high", "jump", "rise", "climbs", "boost", "positive"
-        ]
-        negative_keywords = [
-            "fall", "drop", "plunge", "loss", "miss", "downgrade", "bearish",
-            "decline", "weak", "concern", "risk", "cut", "underperform", "low",
-            "tumble", "sink", "crash", "slump", "negative", "disappointing"
-        ]
-
-        positive_count = sum(1 for keyword in positive_keywords if keyword in text)
-        negative_count = sum(1 for keyword in negative_keywords if keyword in text)
+        # Count distinct keywords present, matching substrings anywhere in the text
+        positive_count = len({m.lower() for m in _POSITIVE_RE.findall(text)})
+        negative_count = len({m.lower() for m in _NEGATIVE_RE.findall(text)})
 
         if positive_count > negative_count:
             return "positive"
@@ -208,11 +738,24 @@ class NewsService:
                 "neutral": 0
             }
 
-        positive = sum(1 for a in articles if a.get("sentiment") == "positive")
-        negative = sum(1 for a in articles if a.get("sentiment") == "negative")
-        neutral = sum(1 for a in articles if a.get("sentiment") == "neutral")
+        counts = Counter(a.get("sentiment") for a in articles)
+        return self._summarize_sentiment_counts(counts, len(articles))
+
+    def _summarize_sentiment_counts(self, counts: Counter, total: int) -> Dict[str, Any]:
+        """
+        Calculate overall sentiment from per-label article counts.
+
+        Args:
+            counts: Number of articles per sentiment label
+            total: Total number of articles
+
+        Returns:
+            Dictionary with overall sentiment, score, and counts
+        """
+        positive = counts["positive"]
+        negative = counts["negative"]
+        neutral = counts["neutral"]
 
-        total = len(articles)
         score = (positive - negative) / total if total > 0 else 0.0
 
         # Determine overall sentiment based on score
@@ -1,8 +1,16 @@
 """Portfolio analyzer service that integrates stock data, news, and AI analysis."""
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import httpx
 from backend.services.stock_data import StockDataService
 from backend.services.news_service import NewsService
 from backend.services.ai_agent import AIAgentService
+from backend.services.llm_cache import LLMCache, CacheMiss
+
+
+# Worker threads for per-ticker fetches (the API compares at most 10 tickers)
+FETCH_MAX_WORKERS = 10
 
 
 class PortfolioAnalyzer:
@@ -15,7 +23,11 @@ class PortfolioAnalyzer:
         self,
         anthropic_api_key: str,
         finnhub_api_key: str,
-        ai_model: str = "claude-sonnet-4-5-20250929"
+        ai_model: str = "claude-sonnet-4-5-20250929",
+        llm_cache: Optional[LLMCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        ai_fast_model: str = "claude-haiku-4-5-20251001",
+        news_service: Optional[NewsService] = None
     ):
         """
         Initialize portfolio analyzer with all required services.
@@ -24,19 +36,44 @@ class PortfolioAnalyzer:
             anthropic_api_key: Anthropic API key for AI analysis
             finnhub_api_key: Finnhub API key for news data
             ai_model: Claude model to use (default: claude-sonnet-4-5-20250929)
+            llm_cache: Optional cache for Claude responses
+            http_client: Optional shared async HTTP client for news requests
+            ai_fast_model: Claude model for short structured tasks
+                (default: claude-haiku-4-5-20251001)
+            news_service: Optional shared news service (and its news cache);
+                the caller keeps ownership and closes it
 
         Raises:
             ValueError: If required API keys are missing
         """
         self.stock_service = StockDataService()
-        self.news_service = NewsService(api_key=finnhub_api_key)
-        self.ai_service = AIAgentService(api_key=anthropic_api_key, model=ai_model)
+        self._owns_news_service = news_service is None
+        self.news_service = news_service or NewsService(api_key=finnhub_api_key, http_client=http_client)
+        self.ai_service = AIAgentService(
+            api_key=anthropic_api_key,
+            model=ai_model,
+            cache=llm_cache,
+            fast_model=ai_fast_model
+        )
+        # Blocking yfinance/Finnhub fetches run here, bounding upstream concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=FETCH_MAX_WORKERS,
+            thread_name_prefix="analyzer"
+        )
+
+    def close(self) -> None:
+        """Shut down the fetch thread pool and, if this analyzer created it, the news service's pool."""
+        self._executor.shutdown(wait=False)
+        if self._owns_news_service:
+            self.news_service.close()
 
     def analyze_investment(
         self,
         ticker: str,
         user_question: Optional[str] = None,
-        include_recommendation: bool = True
+        include_recommendation: bool = True,
+        cache_only: bool = False,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Perform comprehensive investment analysis for a stock.
@@ -45,12 +82,17 @@ class PortfolioAnalyzer:
         1. Fetches stock data and financial metrics
         2. Retrieves recent news and sentiment
         3. Generates AI-powered analysis
-        4. Provides investment recommendation
+        4. Provides investment recommendation (from the same Claude call as
+           the analysis)
 
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
             user_question: Optional specific question about the stock
             include_recommendation: Whether to include buy/hold/sell recommendation
+            cache_only: Only use cached AI responses; on a miss, return
+                success=False with cache_miss=True instead of calling Claude
+            bypass_cache: Ignore cached AI responses and call Claude (the
+                fresh responses replace the cached ones)
 
         Returns:
             Dictionary with complete analysis including:
@@ -67,49 +109,114 @@ class PortfolioAnalyzer:
             >>> print(result['recommendation']['recommendation'])  # BUY/HOLD/SELL
         """
         try:
-            # Step 1: Fetch stock data
-            stock_info = self.stock_service.get_stock_info(ticker)
-            financial_metrics = self.stock_service.get_financial_metrics(ticker)
-
-            # Step 2: Fetch news and sentiment
-            news = self.news_service.get_company_news(ticker, limit=10)
-            news_sentiment = self.news_service.get_news_sentiment(ticker)
+            # Steps 1-2: Fetch stock data, news and sentiment concurrently
+            stock_future = self._executor.submit(self._fetch_stock_data, ticker)
+            news_future = self._executor.submit(self._fetch_news_and_sentiment, ticker)
 
-            # Step 3: Generate AI analysis
-            ai_analysis = self.ai_service.analyze_stock(
-                ticker=ticker,
-                stock_data=stock_info,
-                news=news,
-                user_question=user_question
-            )
+            stock_info, financial_metrics = stock_future.result()
+            news, news_sentiment = news_future.result()
 
-            # Step 4: Generate recommendation (if requested)
+            # Steps 3-4: Generate AI analysis, with the recommendation in the
+            # same call when requested
             recommendation = None
             if include_recommendation:
-                recommendation = self.ai_service.generate_recommendation(
+                ai_analysis, recommendation = self.ai_service.analyze_with_recommendation(
+                    ticker=ticker,
+                    stock_data=stock_info,
+                    news=news,
+                    user_question=user_question,
+                    cache_only=cache_only,
+                    bypass_cache=bypass_cache
+                )
+            else:
+                ai_analysis = self.ai_service.analyze_stock(
                     ticker=ticker,
-                    analysis=ai_analysis['analysis'],
-                    stock_data=stock_info
+                    stock_data=stock_info,
+                    news=news,
+                    user_question=user_question,
+                    cache_only=cache_only,
+                    bypass_cache=bypass_cache
                 )
 
             # Combine all results
+            return self._investment_result(
+                ticker, stock_info, financial_metrics, news_sentiment, ai_analysis, recommendation
+            )
+
+        except CacheMiss:
+            return self._cache_miss_result(ticker)
+        except Exception as e:
             return {
                 "ticker": ticker,
-                "stock_info": {
-                    "name": stock_info.get('name'),
-                    "current_price": stock_info.get('current_price'),
-                    "market_cap": stock_info.get('market_cap'),
-                    "pe_ratio": stock_info.get('pe_ratio'),
-                    "sector": stock_info.get('sector'),
-                    "industry": stock_info.get('industry'),
-                },
-                "financial_metrics": financial_metrics,
-                "news_summary": news_sentiment,
-                "ai_analysis": ai_analysis,
-                "recommendation": recommendation,
-                "success": True
+                "error": str(e),
+                "success": False
             }
 
+    async def analyze_investment_async(
+        self,
+        ticker: str,
+        user_question: Optional[str] = None,
+        include_recommendation: bool = True,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async version of analyze_investment() that does not block the event loop.
+
+        Stock data is fetched on the analyzer's thread pool (yfinance is
+        synchronous) while news and sentiment come from the async news client;
+        the Claude calls use the async client.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., 'AAPL')
+            user_question: Optional specific question about the stock
+            include_recommendation: Whether to include buy/hold/sell recommendation
+            cache_only: Only use cached AI responses; on a miss, return
+                success=False with cache_miss=True instead of calling Claude
+            bypass_cache: Ignore cached AI responses and call Claude (the
+                fresh responses replace the cached ones)
+
+        Returns:
+            Dictionary with complete analysis (same shape as analyze_investment())
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> result = await analyzer.analyze_investment_async("AAPL")
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            (stock_info, financial_metrics), (news, news_sentiment) = await asyncio.gather(
+                loop.run_in_executor(self._executor, self._fetch_stock_data, ticker),
+                self._fetch_news_and_sentiment_async(ticker)
+            )
+
+            recommendation = None
+            if include_recommendation:
+                ai_analysis, recommendation = await self.ai_service.analyze_with_recommendation_async(
+                    ticker=ticker,
+                    stock_data=stock_info,
+                    news=news,
+                    user_question=user_question,
+                    cache_only=cache_only,
+                    bypass_cache=bypass_cache
+                )
+            else:
+                ai_analysis = await self.ai_service.analyze_stock_async(
+                    ticker=ticker,
+                    stock_data=stock_info,
+                    news=news,
+                    user_question=user_question,
+                    cache_only=cache_only,
+                    bypass_cache=bypass_cache
+                )
+
+            return self._investment_result(
+                ticker, stock_info, financial_metrics, news_sentiment, ai_analysis, recommendation
+            )
+
+        except CacheMiss:
+            return self._cache_miss_result(ticker)
         except Exception as e:
             return {
                 "ticker": ticker,
@@ -117,6 +224,157 @@ class PortfolioAnalyzer:
                 "success": False
             }
 
+    async def analyze_investment_stream(
+        self,
+        ticker: str,
+        user_question: Optional[str] = None,
+        include_recommendation: bool = True,
+        cache_only: bool = False,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream an investment analysis as (event, payload) pairs.
+
+        Yields, in order:
+            - ("data", {...}): stock_info, financial_metrics and news_summary
+            - ("analysis", str): chunks of the AI analysis text as they arrive
+            - ("recommendation", {...}): the recommendation, once the analysis
+              is complete (only if include_recommendation is set)
+
+        With cache_only set, a missing cached response ends the stream with
+        ("cache_miss", {...}) instead, shaped like analyze_investment()'s
+        cache miss result.
+
+        Stock data and news are fetched before the first event, so data errors
+        surface on the first iteration.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., 'AAPL')
+            user_question: Optional specific question about the stock
+            include_recommendation: Whether to include buy/hold/sell recommendation
+            cache_only: Only use cached AI responses; never call Claude
+            bypass_cache: Ignore cached AI responses and call Claude (the
+                fresh responses replace the cached ones)
+
+        Raises:
+            ValueError: If stock data, news, or the AI analysis cannot be fetched
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> async for event, payload in analyzer.analyze_investment_stream("AAPL"):
+            ...     if event == "analysis":
+            ...         print(payload, end="")
+        """
+        loop = asyncio.get_running_loop()
+        (stock_info, financial_metrics), (news, news_sentiment) = await asyncio.gather(
+            loop.run_in_executor(self._executor, self._fetch_stock_data, ticker),
+            self._fetch_news_and_sentiment_async(ticker)
+        )
+
+        result = self._investment_result(
+            ticker, stock_info, financial_metrics, news_sentiment, None, None
+        )
+        yield "data", {key: result[key] for key in ("ticker", "stock_info", "financial_metrics", "news_summary")}
+
+        chunks = []
+        try:
+            async for chunk in self.ai_service.analyze_stock_stream(
+                ticker=ticker,
+                stock_data=stock_info,
+                news=news,
+                user_question=user_question,
+                cache_only=cache_only,
+                bypass_cache=bypass_cache
+            ):
+                chunks.append(chunk)
+                yield "analysis", chunk
+
+            if include_recommendation:
+                recommendation = await self.ai_service.generate_recommendation_async(
+                    ticker=ticker,
+                    analysis="".join(chunks),
+                    stock_data=stock_info,
+                    cache_only=cache_only,
+                    bypass_cache=bypass_cache
+                )
+                yield "recommendation", recommendation
+
+        except CacheMiss:
+            yield "cache_miss", self._cache_miss_result(ticker)
+
+    @staticmethod
+    def _investment_result(
+        ticker: str,
+        stock_info: Dict[str, Any],
+        financial_metrics: Dict[str, Any],
+        news_sentiment: Dict[str, Any],
+        ai_analysis: Dict[str, Any],
+        recommendation: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Combine the fetched data and AI output into an analyze_investment() result."""
+        return {
+            "ticker": ticker,
+            "stock_info": {
+                "name": stock_info.get('name'),
+                "current_price": stock_info.get('current_price'),
+                "market_cap": stock_info.get('market_cap'),
+                "pe_ratio": stock_info.get('pe_ratio'),
+                "sector": stock_info.get('sector'),
+                "industry": stock_info.get('industry'),
+            },
+            "financial_metrics": financial_metrics,
+            "news_summary": news_sentiment,
+            "ai_analysis": ai_analysis,
+            "recommendation": recommendation,
+            "success": True
+        }
+
+    @staticmethod
+    def _cache_miss_result(ticker: str) -> Dict[str, Any]:
+        """Result returned when cache_only is set and no cached analysis exists."""
+        return {
+            "ticker": ticker,
+            "error": "cache miss",
+            "cache_miss": True,
+            "success": False
+        }
+
+    def _fetch_stock_data(self, ticker: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Fetch stock info and financial metrics from a single yfinance info download.
+
+        Raises:
+            ValueError: If the stock data cannot be fetched
+        """
+        try:
+            info = self.stock_service._fetch_info(ticker)
+        except Exception as e:
+            raise ValueError(f"Error fetching data for {ticker}: {str(e)}")
+
+        stock_info = self.stock_service.get_stock_info(ticker, info=info)
+        financial_metrics = self.stock_service.get_financial_metrics(ticker, info=info)
+        return stock_info, financial_metrics
+
+    def _fetch_news_and_sentiment(self, ticker: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Fetch recent news and its sentiment summary for a ticker.
+
+        The two run back to back in one task so the sentiment call reuses the
+        news service's cached Finnhub response instead of fetching it again.
+        """
+        news = self.news_service.get_company_news(ticker, limit=10)
+        news_sentiment = self.news_service.get_news_sentiment(ticker)
+        return news, news_sentiment
+
+    async def _fetch_news_and_sentiment_async(
+        self,
+        ticker: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Async version of _fetch_news_and_sentiment(); the sentiment call reuses the cached news."""
+        news = await self.news_service.get_company_news_async(ticker, limit=10)
+        news_sentiment = await self.news_service.get_news_sentiment_async(ticker)
+        return news, news_sentiment
+
     def answer_question(
         self,
         ticker: str,
@@ -138,9 +396,12 @@ class PortfolioAnalyzer:
             >>> print(result['answer'])
         """
         try:
-            # Gather context
-            stock_info = self.stock_service.get_stock_info(ticker)
-            news = self.news_service.get_company_news(ticker, limit=5)
+            # Gather context concurrently
+            info_future = self._executor.submit(self.stock_service.get_stock_info, ticker)
+            news_future = self._executor.submit(self.news_service.get_company_news, ticker, limit=5)
+
+            stock_info = info_future.result()
+            news = news_future.result()
 
             # Get AI answer
             answer = self.ai_service.answer_question(
@@ -166,51 +427,320 @@ class PortfolioAnalyzer:
                 "success": False
             }
 
-    def compare_stocks(
+    async def answer_question_async(
         self,
-        tickers: list[str]
+        ticker: str,
+        question: str
+    ) -> Dict[str, Any]:
+        """
+        Async version of answer_question() that does not block the event loop.
+
+        Stock info (in a worker thread) and news are fetched concurrently, then
+        the question is answered with the async Claude client.
+
+        Args:
+            ticker: Stock ticker symbol
+            question: User's question about the stock
+
+        Returns:
+            Dictionary with the answer and supporting data
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> result = await analyzer.answer_question_async("AAPL", "Is this a good long-term investment?")
+            >>> print(result['answer'])
+        """
+        try:
+            stock_info, news = await asyncio.gather(
+                self.stock_service.get_stock_info_async(ticker),
+                self.news_service.get_company_news_async(ticker, limit=5)
+            )
+
+            answer = await self.ai_service.answer_question_async(
+                ticker=ticker,
+                question=question,
+                stock_data=stock_info,
+                news=news
+            )
+
+            return {
+                "ticker": ticker,
+                "question": question,
+                "answer": answer,
+                "stock_price": stock_info.get('current_price'),
+                "success": True
+            }
+
+        except Exception as e:
+            return {
+                "ticker": ticker,
+                "question": question,
+                "error": str(e),
+                "success": False
+            }
+
+    async def answer_question_stream(
+        self,
+        ticker: str,
+        question: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream the answer to a question about a stock as it is generated.
+
+        Stock data and news are fetched concurrently before the first chunk is
+        yielded, so data errors surface on the first iteration.
+
+        Args:
+            ticker: Stock ticker symbol
+            question: User's question about the stock
+
+        Yields:
+            Chunks of the answer text
+
+        Raises:
+            ValueError: If stock data, news, or the AI answer cannot be fetched
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> async for chunk in analyzer.answer_question_stream("AAPL", "Is it overvalued?"):
+            ...     print(chunk, end="")
+        """
+        stock_info, news = await asyncio.gather(
+            self.stock_service.get_stock_info_async(ticker),
+            self.news_service.get_company_news_async(ticker, limit=5)
+        )
+
+        async for chunk in self.ai_service.answer_question_stream(
+            ticker=ticker,
+            question=question,
+            stock_data=stock_info,
+            news=news
+        ):
+            yield chunk
+
+    async def compare_stocks(
+        self,
+        tickers: list[str],
+        include_analysis: bool = False
     ) -> Dict[str, Any]:
         """
         Compare multiple stocks side by side.
 
+        Tickers are fetched concurrently on the analyzer's thread pool, which
+        also bounds the number of upstream requests in flight.
+
         Args:
             tickers: List of stock ticker symbols to compare
+            include_analysis: Add an ai_analysis to each stock, generated with
+                several tickers per Claude call
 
         Returns:
-            Dictionary with comparison data for each stock
+            Dictionary with comparison data for each stock (in input order)
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> result = await analyzer.compare_stocks(["AAPL", "GOOGL", "MSFT"])
+        """
+        loop = asyncio.get_running_loop()
+
+        if include_analysis:
+            inputs = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self._fetch_comparison_inputs, ticker)
+                for ticker in tickers
+            ))
+            comparisons = await asyncio.to_thread(self._compare_with_analysis, tickers, inputs)
+        else:
+            comparisons = await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self._compare_one, ticker)
+                for ticker in tickers
+            ))
+
+        return {
+            "comparisons": list(comparisons),
+            "count": len(tickers)
+        }
+
+    async def compare_stocks_iter(self, tickers: list[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Compare multiple stocks, yielding each ticker's entry as soon as it is ready.
+
+        Entries are the same as in compare_stocks() (without AI analysis) but
+        arrive in completion order, so the first row is available after the
+        fastest ticker rather than the slowest. Failed tickers are yielded as
+        entries with success False.
+
+        Args:
+            tickers: List of stock ticker symbols to compare
+
+        Yields:
+            Comparison entry for each ticker, in completion order
 
         Example:
             >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
-            >>> result = analyzer.compare_stocks(["AAPL", "GOOGL", "MSFT"])
+            >>> async for row in analyzer.compare_stocks_iter(["AAPL", "GOOGL", "MSFT"]):
+            ...     print(row["ticker"], row.get("price"))
         """
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(self._executor, self._compare_one, ticker) for ticker in tickers]
+
+        for future in asyncio.as_completed(futures):
+            yield await future
+
+    def _compare_with_analysis(
+        self,
+        tickers: list[str],
+        inputs: List[Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any], Optional[Exception]]]
+    ) -> List[Dict[str, Any]]:
+        """Build comparison entries from fetched inputs, analyzing them in batched Claude calls."""
+        ready = [ticker for ticker, (*_, error) in zip(tickers, inputs) if error is None]
+
+        try:
+            analyses = dict(zip(ready, self.ai_service.compare_stocks_ai(
+                ready,
+                {ticker: stock_info for ticker, (stock_info, *_) in zip(tickers, inputs)},
+                {ticker: news for ticker, (_, news, *_) in zip(tickers, inputs)},
+                executor=self._executor
+            )))
+        except Exception as e:
+            return [self._comparison_error(ticker, error or e) for ticker, (*_, error) in zip(tickers, inputs)]
+
         comparisons = []
+        for ticker, (stock_info, _, news_sentiment, error) in zip(tickers, inputs):
+            if error:
+                comparisons.append(self._comparison_error(ticker, error))
+                continue
+            analysis = analyses[ticker]
+            if isinstance(analysis, Exception):
+                comparisons.append(self._comparison_error(ticker, analysis))
+                continue
+            row = self._comparison_row(ticker, stock_info, news_sentiment)
+            row["ai_analysis"] = analysis
+            comparisons.append(row)
+        return comparisons
+
+    def compare_stocks_batch(
+        self,
+        tickers: list[str],
+        wait: bool = True,
+        timeout: float = 300.0
+    ) -> Dict[str, Any]:
+        """
+        Compare multiple stocks with an AI analysis of each, using the Message Batches API.
+
+        Batched analyses cost half as much as live calls but may take minutes.
+        Any ticker whose analysis is not ready within the timeout (or errored
+        in the batch) falls back to a live analyze_stock() call.
+
+        Args:
+            tickers: List of stock ticker symbols to compare
+            wait: Wait for the batch to finish; when False, return the batch ID
+                right after submitting so results can be collected later with
+                ai_service.collect_analysis_batch()
+            timeout: Seconds to wait for the batch before falling back
+
+        Returns:
+            Dictionary with comparison data and ai_analysis for each stock (in
+            input order) and the batch_id
 
-        for ticker in tickers:
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> result = analyzer.compare_stocks_batch(["AAPL", "GOOGL", "MSFT"], timeout=120)
+            >>> result["comparisons"][0]["ai_analysis"]["key_points"]
+        """
+        inputs = list(self._executor.map(self._fetch_comparison_inputs, tickers))
+        ready = [ticker for ticker, (*_, error) in zip(tickers, inputs) if error is None]
+        data_by_ticker = {ticker: stock_info for ticker, (stock_info, *_) in zip(tickers, inputs)}
+        news_by_ticker = {ticker: news for ticker, (_, news, *_) in zip(tickers, inputs)}
+
+        batch_id = None
+        analyses: Dict[str, Dict[str, Any]] = {}
+        if ready:
+            try:
+                batch_id = self.ai_service.submit_analysis_batch(ready, data_by_ticker, news_by_ticker)
+                if not wait:
+                    return {"batch_id": batch_id, "tickers": ready, "count": len(tickers)}
+                analyses = self.ai_service.collect_analysis_batch(
+                    batch_id, ready, data_by_ticker, timeout=timeout
+                )
+            except Exception:
+                # Batch unavailable; every ticker falls back to a live call below
+                analyses = {}
+
+        live_futures = {
+            ticker: self._executor.submit(
+                self.ai_service.analyze_stock, ticker, data_by_ticker[ticker], news_by_ticker[ticker]
+            )
+            for ticker in ready
+            if ticker not in analyses
+        }
+
+        comparisons = []
+        for ticker, (stock_info, _, news_sentiment, error) in zip(tickers, inputs):
             try:
-                stock_info = self.stock_service.get_stock_info(ticker)
-                news_sentiment = self.news_service.get_news_sentiment(ticker)
-
-                comparisons.append({
-                    "ticker": ticker,
-                    "name": stock_info.get('name'),
-                    "price": stock_info.get('current_price'),
-                    "pe_ratio": stock_info.get('pe_ratio'),
-                    "market_cap": stock_info.get('market_cap'),
-                    "profit_margin": stock_info.get('profit_margins'),
-                    "revenue_growth": stock_info.get('revenue_growth'),
-                    "news_sentiment": news_sentiment.get('sentiment'),
-                    "success": True
-                })
+                if error:
+                    raise error
+                analysis = analyses.get(ticker) or live_futures[ticker].result()
             except Exception as e:
-                comparisons.append({
-                    "ticker": ticker,
-                    "error": str(e),
-                    "success": False
-                })
+                comparisons.append(self._comparison_error(ticker, e))
+                continue
+
+            row = self._comparison_row(ticker, stock_info, news_sentiment)
+            row["ai_analysis"] = analysis
+            comparisons.append(row)
 
         return {
             "comparisons": comparisons,
-            "count": len(tickers)
+            "count": len(tickers),
+            "batch_id": batch_id
+        }
+
+    def _fetch_comparison_inputs(
+        self,
+        ticker: str
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any], Optional[Exception]]:
+        """Fetch stock info, news and sentiment for one ticker, capturing any error."""
+        try:
+            stock_info = self.stock_service.get_stock_info(ticker)
+            news, news_sentiment = self._fetch_news_and_sentiment(ticker)
+            return stock_info, news, news_sentiment, None
+        except Exception as e:
+            return {}, [], {}, e
+
+    def _compare_one(self, ticker: str) -> Dict[str, Any]:
+        """Fetch the comparison metrics for a single ticker."""
+        try:
+            stock_info = self.stock_service.get_stock_info(ticker)
+            news_sentiment = self.news_service.get_news_sentiment(ticker)
+            return self._comparison_row(ticker, stock_info, news_sentiment)
+        except Exception as e:
+            return self._comparison_error(ticker, e)
+
+    @staticmethod
+    def _comparison_row(
+        ticker: str,
+        stock_info: Dict[str, Any],
+        news_sentiment: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build a successful comparison entry for a ticker."""
+        return {
+            "ticker": ticker,
+            "name": stock_info.get('name'),
+            "price": stock_info.get('current_price'),
+            "pe_ratio": stock_info.get('pe_ratio'),
+            "market_cap": stock_info.get('market_cap'),
+            "profit_margin": stock_info.get('profit_margins'),
+            "revenue_growth": stock_info.get('revenue_growth'),
+            "news_sentiment": news_sentiment.get('sentiment'),
+            "success": True
+        }
+
+    @staticmethod
+    def _comparison_error(ticker: str, error: Exception) -> Dict[str, Any]:
+        """Build a failed comparison entry for a ticker."""
+        return {
+            "ticker": ticker,
+            "error": str(error),
+            "success": False
         }
 
     def get_news_summary(
@@ -253,3 +783,40 @@ class PortfolioAnalyzer:
                 "error": str(e),
                 "success": False
             }
+
+    async def get_news_summary_async(
+        self,
+        ticker: str
+    ) -> Dict[str, Any]:
+        """
+        Async version of get_news_summary() that does not block the event loop.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Dictionary with news summary and key insights
+
+        Example:
+            >>> analyzer = PortfolioAnalyzer(anthropic_key, finnhub_key)
+            >>> result = await analyzer.get_news_summary_async("TSLA")
+        """
+        try:
+            news = await self.news_service.get_company_news_async(ticker, limit=10)
+            summary = await self.ai_service.summarize_news_async(ticker, news)
+
+            return {
+                "ticker": ticker,
+                "summary": summary['summary'],
+                "sentiment": summary['sentiment'],
+                "key_points": summary['key_points'],
+                "article_count": len(news),
+                "success": True
+            }
+
+        except Exception as e:
+            return {
+                "ticker": ticker,
+                "error": str(e),
+                "success": False
+            }
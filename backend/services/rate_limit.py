@@ -0,0 +1,96 @@
+"""Client-side rate limiting for upstream APIs."""
+import asyncio
+import threading
+import time
+from typing import Mapping, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every caller of an upstream API.
+
+    Tokens refill continuously at rate/per per second up to capacity. Each
+    request takes one token; when the bucket is empty the caller waits for its
+    turn rather than failing, so bursts are smoothed out under the cap.
+    """
+
+    def __init__(self, rate: int = 60, per: float = 60.0, capacity: Optional[int] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Number of requests allowed per period
+            per: Length of the period in seconds
+            capacity: Largest burst allowed at once (default: rate)
+
+        Raises:
+            ValueError: If rate, per or capacity is not positive
+        """
+        if rate <= 0 or per <= 0 or (capacity is not None and capacity <= 0):
+            raise ValueError("rate, per and capacity must be positive")
+
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity or rate
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        # Set when the upstream reports the quota is exhausted
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, blocking the calling thread until one is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Take a token, waiting without blocking the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Slow down early using the quota the upstream reports.
+
+        Reads X-Ratelimit-Remaining (and X-Ratelimit-Reset, a Unix timestamp)
+        and never lets the bucket hold more tokens than the server says are
+        left. When the quota is exhausted, new requests wait until it resets.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        try:
+            remaining = int(headers.get("X-Ratelimit-Remaining"))
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            now = self._refill()
+            self._tokens = min(self._tokens, remaining)
+            if remaining > 0:
+                return
+
+            try:
+                wait = float(headers.get("X-Ratelimit-Reset")) - time.time()
+            except (TypeError, ValueError):
+                wait = self.per / self.rate
+            # Guard against clock skew holding requests for too long
+            wait = min(max(wait, 0.0), self.per)
+            self._paused_until = max(self._paused_until, now + wait)
+
+    def _refill(self) -> float:
+        """Add the tokens earned since the last update; call with the lock held."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+        return now
+
+    def _reserve(self) -> float:
+        """Take a token (possibly on credit) and return how long to wait for it."""
+        with self._lock:
+            now = self._refill()
+            self._tokens -= 1
+            delay = -self._tokens * self.per / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._paused_until - now)
@@ -1,26 +1,123 @@
 """Stock data fetching service using yfinance."""
+import asyncio
+import logging
 import yfinance as yf
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
+from functools import lru_cache
+import numpy as np
 import pandas as pd
+from backend.services.cache import ttl_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds to reuse yfinance responses before downloading them again
+INFO_CACHE_TTL = 300
+HISTORY_CACHE_TTL = 60
+
+# Trading sessions per year, for annualizing daily volatility
+TRADING_DAYS_PER_YEAR = 252
+
+# quoteSummary modules holding every field read by get_stock_info() and
+# get_financial_metrics()
+INFO_MODULES = [
+    "financialData", "quoteType", "defaultKeyStatistics", "assetProfile", "summaryDetail", "price"
+]
+
+# The quoteSummary fetch goes through a private yfinance API (Ticker._quote._fetch),
+# which is why requirements.txt pins yfinance exactly. These flags record that the
+# Ticker.info fallback has been logged, and that the private API no longer exists
+# in the installed version (so later calls skip straight to the fallback).
+_fallback_logged = False
+_quote_fetch_unavailable = False
+
+
+def _log_info_fallback(ticker: str, reason: str) -> None:
+    """Warn the first time _fetch_info() falls back to Ticker.info."""
+    global _fallback_logged
+    if _fallback_logged:
+        return
+    _fallback_logged = True
+    logger.warning(
+        "quoteSummary fetch for %s failed (%s) with yfinance %s; falling back to Ticker.info, "
+        "which makes extra requests per ticker",
+        ticker, reason, yf.__version__
+    )
+
+
+@lru_cache(maxsize=512)
+def _ticker(symbol: str) -> yf.Ticker:
+    """
+    Get a reusable yfinance Ticker for an (upper-case) symbol.
+
+    yfinance already shares one HTTP session across all Ticker objects; reusing
+    the object also keeps per-ticker state such as the exchange timezone that
+    history() would otherwise look up again.
+    """
+    return yf.Ticker(symbol)
+
 
 class StockDataService:
     """Service for fetching stock market data."""
 
     @staticmethod
-    def get_stock_info(ticker: str) -> Dict[str, Any]:
+    @ttl_cache(ttl=INFO_CACHE_TTL)
+    def _fetch_info(ticker: str) -> Dict[str, Any]:
+        """
+        Download the raw info fields for a ticker.
+
+        Requests only INFO_MODULES from Yahoo's quoteSummary endpoint in a
+        single call (through yfinance's session, which handles cookies and
+        crumbs), instead of the three requests behind Ticker.info. Falls back
+        to Ticker.info if the quoteSummary request fails.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Flat info dictionary with the same keys as Ticker.info (cached for
+            INFO_CACHE_TTL seconds)
+        """
+        global _quote_fetch_unavailable
+        response, reason = None, "private API unavailable"
+        if not _quote_fetch_unavailable:
+            try:
+                response = _ticker(ticker.upper())._quote._fetch(modules=INFO_MODULES)
+                reason = "empty response"
+            except (AttributeError, TypeError) as e:
+                # The private API changed in this yfinance version; stop calling it
+                _quote_fetch_unavailable = True
+                reason = f"private API changed: {e}"
+            except Exception as e:
+                # Rate limits and connection errors are raised rather than returned
+                reason = type(e).__name__
+        results = ((response or {}).get("quoteSummary") or {}).get("result")
+        if not results:
+            _log_info_fallback(ticker, reason)
+            # A fresh Ticker, since Ticker.info is memoized on the object
+            return yf.Ticker(ticker).info
+
+        info: Dict[str, Any] = {}
+        for module in results[0].values():
+            if isinstance(module, dict):
+                info.update((key, value) for key, value in module.items() if value is not None)
+        return info
+
+    @staticmethod
+    def get_stock_info(ticker: str, info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Fetch comprehensive stock information.
 
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
+            info: Raw info from _fetch_info(), to skip downloading it again
 
         Returns:
             Dictionary containing stock information
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            if info is None:
+                info = StockDataService._fetch_info(ticker)
 
             return {
                 "ticker": ticker.upper(),
@@ -49,6 +146,7 @@ class StockDataService:
             raise ValueError(f"Error fetching data for {ticker}: {str(e)}")
 
     @staticmethod
+    @ttl_cache(ttl=HISTORY_CACHE_TTL)
     def get_historical_data(
         ticker: str, period: str = "1y", interval: str = "1d"
     ) -> pd.DataFrame:
@@ -61,15 +159,68 @@ class StockDataService:
             interval: Data interval (e.g., '1m', '5m', '1h', '1d', '1wk', '1mo')
 
         Returns:
-            DataFrame with historical data
+            DataFrame with historical data (cached for HISTORY_CACHE_TTL seconds)
         """
         try:
-            stock = yf.Ticker(ticker)
+            stock = _ticker(ticker.upper())
             hist = stock.history(period=period, interval=interval)
             return hist
         except Exception as e:
             raise ValueError(f"Error fetching historical data for {ticker}: {str(e)}")
 
+    @staticmethod
+    def get_historical_data_batch(
+        tickers: List[str], period: str = "1y", interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical price data for several tickers at once.
+
+        Uses yf.download(), which fetches the tickers concurrently on its own
+        thread pool, so latency is bounded by the slowest ticker rather than
+        the sum of all of them. Frames hold the OHLCV columns only (no
+        dividends or splits), and are not shared with get_historical_data()'s
+        cache.
+
+        Args:
+            tickers: Stock ticker symbols
+            period: Time period (e.g., '1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max')
+            interval: Data interval (e.g., '1m', '5m', '1h', '1d', '1wk', '1mo')
+
+        Returns:
+            Dictionary mapping each ticker (upper-cased, in input order) to its
+            historical data. Tickers with no data are omitted.
+
+        Raises:
+            ValueError: If the download fails
+        """
+        symbols = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        if not symbols:
+            return {}
+
+        try:
+            data = yf.download(
+                symbols,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            raise ValueError(f"Error fetching historical data for {', '.join(symbols)}: {str(e)}")
+
+        downloaded = set(data.columns.get_level_values(0))
+        histories: Dict[str, pd.DataFrame] = {}
+        for symbol in symbols:
+            if symbol not in downloaded:
+                continue
+            # Rows are aligned across tickers, so drop dates this one did not trade
+            hist = data[symbol].dropna(how="all")
+            if not hist.empty:
+                histories[symbol] = hist
+        return histories
+
     @staticmethod
     def get_price_summary(ticker: str, period: str = "1y") -> Dict[str, Any]:
         """
@@ -88,38 +239,45 @@ class StockDataService:
             if hist.empty:
                 return {"error": "No historical data available"}
 
-            current_price = hist["Close"].iloc[-1]
-            period_start_price = hist["Close"].iloc[0]
+            # Work on the raw arrays to skip pandas index and Series overhead;
+            # the nan-aware reductions match pandas' skipna behavior
+            close = hist["Close"].to_numpy(dtype=float)
+            current_price = close[-1]
+            period_start_price = close[0]
             period_return = (
                 (current_price - period_start_price) / period_start_price
             ) * 100
+            daily_returns = close[1:] / close[:-1] - 1
+            volatility = np.nanstd(daily_returns, ddof=1) * 100
 
             return {
                 "current_price": round(current_price, 2),
                 "period_start_price": round(period_start_price, 2),
                 "period_return_pct": round(period_return, 2),
-                "period_high": round(hist["High"].max(), 2),
-                "period_low": round(hist["Low"].min(), 2),
-                "avg_volume": int(hist["Volume"].mean()),
-                "volatility": round(hist["Close"].pct_change().std() * 100, 2),
+                "period_high": round(np.nanmax(hist["High"].to_numpy(dtype=float)), 2),
+                "period_low": round(np.nanmin(hist["Low"].to_numpy(dtype=float)), 2),
+                "avg_volume": int(np.nanmean(hist["Volume"].to_numpy(dtype=float))),
+                "volatility": round(volatility, 2),
+                "annualized_volatility": round(volatility * np.sqrt(TRADING_DAYS_PER_YEAR), 2),
             }
         except Exception as e:
             return {"error": str(e)}
 
     @staticmethod
-    def get_financial_metrics(ticker: str) -> Dict[str, Any]:
+    def get_financial_metrics(ticker: str, info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get key financial metrics for analysis.
 
         Args:
             ticker: Stock ticker symbol
+            info: Raw info from _fetch_info(), to skip downloading it again
 
         Returns:
             Dictionary with financial metrics
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            if info is None:
+                info = StockDataService._fetch_info(ticker)
 
             metrics = {
                 "valuation": {
@@ -157,3 +315,48 @@ class StockDataService:
             return metrics
         except Exception as e:
             return {"error": str(e)}
+
+    # yfinance is blocking, so the async variants run the sync methods in a
+    # worker thread to keep the event loop free while Yahoo responds
+
+    @staticmethod
+    async def get_stock_info_async(ticker: str) -> Dict[str, Any]:
+        """
+        Async wrapper around get_stock_info() for use from the event loop.
+
+        Example:
+            >>> info = await StockDataService.get_stock_info_async("AAPL")
+        """
+        return await asyncio.to_thread(StockDataService.get_stock_info, ticker)
+
+    @staticmethod
+    async def get_historical_data_async(
+        ticker: str, period: str = "1y", interval: str = "1d"
+    ) -> pd.DataFrame:
+        """
+        Async wrapper around get_historical_data() for use from the event loop.
+
+        Example:
+            >>> hist = await StockDataService.get_historical_data_async("AAPL", period="1mo")
+        """
+        return await asyncio.to_thread(StockDataService.get_historical_data, ticker, period, interval)
+
+    @staticmethod
+    async def get_price_summary_async(ticker: str, period: str = "1y") -> Dict[str, Any]:
+        """
+        Async wrapper around get_price_summary() for use from the event loop.
+
+        Example:
+            >>> summary = await StockDataService.get_price_summary_async("AAPL")
+        """
+        return await asyncio.to_thread(StockDataService.get_price_summary, ticker, period)
+
+    @staticmethod
+    async def get_financial_metrics_async(ticker: str) -> Dict[str, Any]:
+        """
+        Async wrapper around get_financial_metrics() for use from the event loop.
+
+        Example:
+            >>> metrics = await StockDataService.get_financial_metrics_async("AAPL")
+        """
+        return await asyncio.to_thread(StockDataService.get_financial_metrics, ticker)
@@ -0,0 +1,29 @@
+"""Pytest configuration for the script-style test suites."""
+import inspect
+import pytest
+
+
+def pytest_generate_tests(metafunc):
+    """Run tests that take a `ticker` argument once per ticker in their module's TICKERS."""
+    tickers = getattr(metafunc.module, "TICKERS", None)
+    if tickers and "ticker" in metafunc.fixturenames:
+        metafunc.parametrize("ticker", tickers)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """
+    Fail tests that report failure by returning False.
+
+    The test functions double as steps of the `python backend/tests/test_*.py`
+    scripts, so they catch their own errors and return True or False instead
+    of raising. Without this hook pytest would count a False return as a pass.
+    """
+    function = pyfuncitem.obj
+    if inspect.iscoroutinefunction(function):
+        return None
+
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    result = function(**arguments)
+    assert result is not False, f"{pyfuncitem.name} reported failure (see captured output)"
+    return True
@@ -0,0 +1,91 @@
+"""Helpers for running the script-style test suites."""
+import io
+import json
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+
+class _ThreadLocalStdout:
+    """Stand-in for sys.stdout that sends each worker thread's writes to its own buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        return getattr(self._local, "buffer", self._stream).write(text)
+
+    def flush(self) -> None:
+        getattr(self._local, "buffer", self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def run_tests_parallel(
+    tests: List[Tuple[str, Callable[[], bool]]],
+    max_workers: int = 4,
+    json_lines: bool = False
+) -> List[Tuple[str, bool]]:
+    """
+    Run independent tests concurrently and print their output in order.
+
+    Each test's printed output is buffered and written once it finishes, in
+    the order the tests were given, so the log reads as if they ran one after
+    another. A test that raises counts as failed.
+
+    With json_lines, each test instead writes one JSON object per line for CI,
+    e.g. {"test": "Stock Info", "ok": true, "ms": 412.3}; a failed test also
+    carries its captured output under "output".
+
+    Args:
+        tests: (name, test function) pairs; each function returns True on success
+        max_workers: Number of tests to run at once
+        json_lines: Write a JSON line per test instead of its printed output
+
+    Returns:
+        (name, passed) pairs in the same order as tests
+
+    Example:
+        >>> results = run_tests_parallel([
+        ...     ("Stock Analysis", lambda: test_stock_analysis(agent)),
+        ...     ("Question Answering", lambda: test_answer_question(agent)),
+        ... ])
+    """
+    stdout = _ThreadLocalStdout(sys.stdout)
+
+    def run(test: Callable[[], bool]) -> Tuple[bool, str, float]:
+        buffer = io.StringIO()
+        stdout._local.buffer = buffer
+        started = time.perf_counter_ns()
+        try:
+            passed = bool(test())
+        except Exception:
+            traceback.print_exc(file=buffer)
+            passed = False
+        finally:
+            del stdout._local.buffer
+        return passed, buffer.getvalue(), (time.perf_counter_ns() - started) / 1e6
+
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run, test) for _, test in tests]
+            results = []
+            for (name, _), future in zip(tests, futures):
+                passed, output, elapsed_ms = future.result()
+                if json_lines:
+                    record = {"test": name, "ok": passed, "ms": round(elapsed_ms, 1)}
+                    if not passed:
+                        record["output"] = output
+                    output = json.dumps(record) + "\n"
+                stdout._stream.write(output)
+                results.append((name, passed))
+    finally:
+        sys.stdout = stdout._stream
+
+    return results
@@ -1,6 +1,7 @@
 """Test script for the news_service using Finnhub API."""
 from backend.services.news_service import NewsService
 from backend.config import get_settings
+from backend.tests.runner import run_tests_parallel
 import json
 from datetime import datetime, timedelta
 
@@ -182,12 +183,14 @@ if __name__ == "__main__":
         print("\nFree tier limits: 60 API calls/minute")
         exit(1)
 
-    # Run tests
-    results.append(("Company News", test_company_news(service)))
-    results.append(("Company News with Dates", test_company_news_with_dates(service)))
-    results.append(("Market News", test_market_news(service)))
-    results.append(("News Sentiment", test_news_sentiment(service)))
-    results.append(("Invalid Ticker", test_invalid_ticker(service)))
+    # Run tests concurrently (they are independent; output is still printed test by test)
+    results.extend(run_tests_parallel([
+        ("Company News", lambda: test_company_news(service)),
+        ("Company News with Dates", lambda: test_company_news_with_dates(service)),
+        ("Market News", lambda: test_market_news(service)),
+        ("News Sentiment", lambda: test_news_sentiment(service)),
+        ("Invalid Ticker", lambda: test_invalid_ticker(service)),
+    ]))
 
     # Summary
     print("\n" + "="*60)
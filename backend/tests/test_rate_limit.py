@@ -0,0 +1,177 @@
+"""Offline tests for the TokenBucket rate limiter (no network or API keys needed)."""
+import asyncio
+from contextlib import contextmanager
+from backend.services import rate_limit
+from backend.services.rate_limit import TokenBucket
+from backend.tests.runner import run_tests_parallel
+
+
+class _FakeClock:
+    """Stand-in for the time module whose sleep() just advances the clock."""
+
+    def __init__(self, now=1000.0, wall=1_700_000_000.0):
+        self.now = now
+        self.wall = wall
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.wall
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        self.now += seconds
+        self.wall += seconds
+
+
+@contextmanager
+def _fake_clock():
+    """Swap rate_limit's time module for a fake clock for the duration of a test."""
+    clock = _FakeClock()
+    original = rate_limit.time
+    rate_limit.time = clock
+    try:
+        yield clock
+    finally:
+        rate_limit.time = original
+
+
+def test_burst_cap():
+    """A full bucket allows `capacity` requests at once, then makes callers wait."""
+    with _fake_clock() as clock:
+        bucket = TokenBucket(rate=60, per=60.0, capacity=5)
+        for _ in range(5):
+            bucket.acquire()
+        assert clock.slept == [], f"burst should not wait, slept {clock.slept}"
+
+        bucket.acquire()
+        assert clock.slept == [1.0], f"6th request should wait one refill, slept {clock.slept}"
+    print("✓ Burst capped at capacity")
+    return True
+
+
+def test_refill():
+    """Tokens refill at rate/per and never beyond capacity."""
+    with _fake_clock() as clock:
+        bucket = TokenBucket(rate=10, per=1.0, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+
+        clock.advance(0.2)  # earns 2 tokens
+        bucket.acquire()
+        bucket.acquire()
+        assert clock.slept == [], f"refilled tokens should be free, slept {clock.slept}"
+
+        clock.advance(60)  # far more than capacity's worth
+        for _ in range(3):
+            bucket.acquire()
+        bucket.acquire()
+        assert len(clock.slept) == 1 and abs(clock.slept[0] - 0.1) < 1e-9, (
+            f"refill should stop at capacity, slept {clock.slept}"
+        )
+    print("✓ Tokens refill at the configured rate, up to capacity")
+    return True
+
+
+def test_header_pause():
+    """An exhausted X-Ratelimit-Remaining pauses callers until X-Ratelimit-Reset."""
+    with _fake_clock() as clock:
+        bucket = TokenBucket(rate=60, per=60.0, capacity=10)
+        bucket.update_from_headers({
+            "X-Ratelimit-Remaining": "0",
+            "X-Ratelimit-Reset": str(clock.wall + 5)
+        })
+        bucket.acquire()
+        assert clock.slept == [5.0], f"should wait for the reset, slept {clock.slept}"
+
+        # A reset far in the future is capped at one period
+        bucket.update_from_headers({
+            "X-Ratelimit-Remaining": "0",
+            "X-Ratelimit-Reset": str(clock.wall + 3600)
+        })
+        bucket.acquire()
+        assert clock.slept[-1] == 60.0, f"pause should be capped at per, slept {clock.slept}"
+    print("✓ Exhausted quota header pauses until reset")
+    return True
+
+
+def test_header_remaining_caps_tokens():
+    """A low X-Ratelimit-Remaining drains local tokens; missing or bad headers are ignored."""
+    with _fake_clock() as clock:
+        bucket = TokenBucket(rate=60, per=60.0, capacity=10)
+        bucket.update_from_headers({})
+        bucket.update_from_headers({"X-Ratelimit-Remaining": "abc"})
+        bucket.update_from_headers({"X-Ratelimit-Remaining": "2"})
+        bucket.acquire()
+        bucket.acquire()
+        assert clock.slept == [], f"two tokens should remain, slept {clock.slept}"
+
+        bucket.acquire()
+        assert clock.slept == [1.0], f"third request should wait, slept {clock.slept}"
+    print("✓ Remaining-quota header caps local tokens")
+    return True
+
+
+def test_acquire_async():
+    """acquire_async() waits the same delay as acquire(), on the event loop."""
+    with _fake_clock():
+        bucket = TokenBucket(rate=60, per=60.0, capacity=1)
+        waits = []
+        original_sleep = rate_limit.asyncio.sleep
+
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+
+        rate_limit.asyncio.sleep = fake_sleep
+        try:
+            asyncio.run(bucket.acquire_async())
+            asyncio.run(bucket.acquire_async())
+        finally:
+            rate_limit.asyncio.sleep = original_sleep
+        assert waits == [1.0], f"second request should wait one refill, waited {waits}"
+    print("✓ Async acquire waits without blocking")
+    return True
+
+
+def test_invalid_arguments():
+    """Non-positive rate, period or capacity is rejected."""
+    for kwargs in ({"rate": 0}, {"per": 0}, {"capacity": -1}):
+        try:
+            TokenBucket(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"TokenBucket({kwargs}) should raise ValueError")
+    print("✓ Invalid arguments rejected")
+    return True
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("RATE LIMITER TEST SUITE")
+    print("="*60)
+
+    # The tests swap the module's clock, so run them one at a time
+    results = run_tests_parallel([
+        ("Burst Cap", test_burst_cap),
+        ("Refill", test_refill),
+        ("Header Pause", test_header_pause),
+        ("Header Remaining", test_header_remaining_caps_tokens),
+        ("Async Acquire", test_acquire_async),
+        ("Invalid Arguments", test_invalid_arguments),
+    ], max_workers=1)
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    print("\n" + "="*60)
+    print("TEST SUMMARY")
+    print("="*60)
+    for test_name, result in results:
+        status = "✓ PASS" if result else "✗ FAIL"
+        print(f"{status}: {test_name}")
+    print(f"\nTotal: {passed}/{total} tests passed")
@@ -1,117 +1,264 @@
-"""Simple test script to verify the stock_data service is working."""
-from backend.services.stock_data import StockDataService
-import json
+"""Simple test script to verify the stock_data service is working.
 
+Run a subset by naming the tests, e.g.
+`python backend/tests/test_stock_service.py test_price_summary`.
+Set TEST_OUTPUT=jsonl to get one JSON line per test (for CI) instead of the
+printed report.
+"""
+from backend.tests.runner import run_tests_parallel
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import cache, lru_cache, partial
+from pathlib import Path
+import os
+import sys
+import time
 
-def test_stock_info():
-    """Test fetching stock info."""
-    print("\n" + "="*60)
-    print("Testing get_stock_info() with AAPL")
-    print("="*60)
+# Section divider for the printed report
+_SEP = "=" * 60
+
+# Tickers every per-ticker test runs against (pytest parametrizes on these via
+# conftest.py), and that the batch history test fetches together
+TICKERS = ["AAPL", "MSFT", "GOOG", "AMZN", "META"]
+
+# Columns every yfinance history frame should have
+_EXPECTED_COLUMNS = ("Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits")
+_EXPECTED_COLUMNS_TEXT = ", ".join(_EXPECTED_COLUMNS)
+
+# Opt-in on-disk cache of historical data, reused for the rest of the day
+# (e.g. STOCK_TEST_CACHE_DIR=.cache/hist)
+_HIST_CACHE = os.getenv("STOCK_TEST_CACHE_DIR")
+
+
+@cache
+def _service():
+    """Get the stock data service, deferring the yfinance/pandas import to the first test."""
+    from backend.services.stock_data import StockDataService
+    return StockDataService
+
+
+@lru_cache(maxsize=32)
+def _cached_info(ticker):
+    """Download a ticker's raw info once per run, shared by the info-based tests."""
+    return _service()._fetch_info(ticker)
+
+
+def _load_or_fetch_history(ticker, period):
+    """Get historical data, reusing today's copy from the disk cache when it is enabled."""
+    if not _HIST_CACHE:
+        return _service().get_historical_data(ticker, period=period)
     
-    try:
-        info = StockDataService.get_stock_info("AAPL")
-        print(f"✓ Successfully fetched data for {info['name']}")
-        print(f"  Ticker: {info['ticker']}")
-        print(f"  Current Price: ${info['current_price']}")
-        print(f"  Market Cap: ${info['market_cap']:,}" if info['market_cap'] else "  Market Cap: N/A")
-        print(f"  P/E Ratio: {info['pe_ratio']}")
-        print(f"  Sector: {info['sector']}")
-        return True
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return False
+    path = Path(_HIST_CACHE) / f"{ticker}_{period}_{date.today()}.pkl"
+    import pandas as pd
+    if path.exists():
+        return pd.read_pickle(path)
+    
+    hist = _service().get_historical_data(ticker, period=period)
+    if not hist.empty:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a concurrent run never reads a partial file
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        hist.to_pickle(temp)
+        temp.replace(path)
+    return hist
 
 
-def test_historical_data():
-    """Test fetching historical data."""
-    print("\n" + "="*60)
-    print("Testing get_historical_data() with AAPL (last 5 days)")
-    print("="*60)
+def _count_present(values):
+    """Count the metrics in a section that have a value."""
+    return sum(1 for value in values.values() if value is not None)
+
+
+def _run_check(title, fetch, report):
+    """
+    Print a test's header, fetch its data and report on it.
+
+    A fetch that raises or returns a dict with an "error" key fails the test,
+    as does a report that returns False.
+    """
+    print("\n" + _SEP)
+    print(title)
+    print(_SEP)
     
     try:
-        hist = StockDataService.get_historical_data("AAPL", period="5d")
-        print(f"✓ Successfully fetched {len(hist)} days of data")
-        print(f"  Date range: {hist.index[0].date()} to {hist.index[-1].date()}")
-        print(f"  Latest close: ${hist['Close'].iloc[-1]:.2f}")
-        print(f"  Columns: {', '.join(hist.columns)}")
-        return True
+        data = fetch()
+        if isinstance(data, dict) and "error" in data:
+            print(f"✗ Error: {data['error']}")
+            return False
+        return report(data) is not False
     except Exception as e:
         print(f"✗ Error: {e}")
         return False
 
 
-def test_price_summary():
-    """Test price summary."""
-    print("\n" + "="*60)
-    print("Testing get_price_summary() with AAPL")
-    print("="*60)
+def _report_stock_info(info):
+    print(f"✓ Successfully fetched data for {info['name']}")
+    print(f"  Ticker: {info['ticker']}")
+    print(f"  Current Price: ${info['current_price']}")
+    print(f"  Market Cap: ${info['market_cap']:,}" if info['market_cap'] else "  Market Cap: N/A")
+    print(f"  P/E Ratio: {info['pe_ratio']}")
+    print(f"  Sector: {info['sector']}")
+
+
+def _report_historical_data(hist):
+    missing = [column for column in _EXPECTED_COLUMNS if column not in hist.columns]
+    if missing:
+        print(f"✗ Error: missing columns {', '.join(missing)}")
+        return False
     
-    try:
-        summary = StockDataService.get_price_summary("AAPL", period="1mo")
-        if "error" in summary:
-            print(f"✗ Error: {summary['error']}")
-            return False
-        
-        print(f"✓ Successfully fetched price summary")
-        print(f"  Current Price: ${summary['current_price']}")
-        print(f"  Period Return: {summary['period_return_pct']}%")
-        print(f"  Period High: ${summary['period_high']}")
-        print(f"  Period Low: ${summary['period_low']}")
-        print(f"  Volatility: {summary['volatility']}%")
-        return True
-    except Exception as e:
-        print(f"✗ Error: {e}")
+    print(f"✓ Successfully fetched {len(hist)} days of data")
+    print(f"  Date range: {hist.index[0].date()} to {hist.index[-1].date()}")
+    print(f"  Latest close: ${hist['Close'].iloc[-1]:.2f}")
+    print(f"  Columns: {_EXPECTED_COLUMNS_TEXT}")
+
+
+def _report_historical_data_batch(histories):
+    missing = [ticker for ticker in TICKERS if ticker not in histories]
+    if missing:
+        print(f"✗ Error: no data for {', '.join(missing)}")
         return False
+    
+    print(f"✓ Successfully fetched data for {len(histories)} tickers")
+    for ticker, hist in histories.items():
+        print(f"  {ticker}: {len(hist)} days, latest close ${hist['Close'].iloc[-1]:.2f}")
 
 
-def test_financial_metrics():
-    """Test financial metrics."""
-    print("\n" + "="*60)
-    print("Testing get_financial_metrics() with AAPL")
-    print("="*60)
+def _report_price_summary(summary):
+    print(f"✓ Successfully fetched price summary")
+    print(f"  Current Price: ${summary['current_price']}")
+    print(f"  Period Return: {summary['period_return_pct']}%")
+    print(f"  Period High: ${summary['period_high']}")
+    print(f"  Period Low: ${summary['period_low']}")
+    print(f"  Volatility: {summary['volatility']}% daily, {summary['annualized_volatility']}% annualized")
+
+
+def _report_financial_metrics(metrics):
+    lines = [
+        "✓ Successfully fetched financial metrics",
+        f"  Valuation metrics: {_count_present(metrics['valuation'])} available",
+        f"  Profitability metrics: {_count_present(metrics['profitability'])} available",
+        f"  Growth metrics: {_count_present(metrics['growth'])} available",
+        f"  Financial health metrics: {_count_present(metrics['financial_health'])} available",
+    ]
     
+    # Show some sample values
+    if pe_ratio := metrics['valuation']['pe_ratio']:
+        lines.append(f"    - P/E Ratio: {pe_ratio:.2f}")
+    if profit_margins := metrics['profitability']['profit_margins']:
+        lines.append(f"    - Profit Margin: {profit_margins*100:.2f}%")
+    
+    print("\n".join(lines))
+
+
+def test_stock_info(ticker, info=None):
+    """Test fetching stock info."""
+    return _run_check(
+        f"Testing get_stock_info() with {ticker}",
+        lambda: _service().get_stock_info(ticker, info=info or _cached_info(ticker)),
+        _report_stock_info
+    )
+
+
+def test_historical_data(ticker):
+    """Test fetching historical data."""
+    return _run_check(
+        f"Testing get_historical_data() with {ticker} (last 5 days)",
+        lambda: _load_or_fetch_history(ticker, "5d"),
+        _report_historical_data
+    )
+
+
+def test_historical_data_batch():
+    """Test fetching historical data for several tickers in one call."""
+    return _run_check(
+        f"Testing get_historical_data_batch() with {', '.join(TICKERS)} (last 5 days)",
+        lambda: _service().get_historical_data_batch(TICKERS, period="5d"),
+        _report_historical_data_batch
+    )
+
+
+def test_price_summary(ticker):
+    """Test price summary."""
+    return _run_check(
+        f"Testing get_price_summary() with {ticker}",
+        lambda: _service().get_price_summary(ticker, period="1mo"),
+        _report_price_summary
+    )
+
+
+def test_financial_metrics(ticker, info=None):
+    """Test financial metrics."""
+    return _run_check(
+        f"Testing get_financial_metrics() with {ticker}",
+        lambda: _service().get_financial_metrics(ticker, info=info or _cached_info(ticker)),
+        _report_financial_metrics
+    )
+
+
+# Tests run once per ticker in TICKERS
+TICKER_TESTS = [
+    ("Stock Info", test_stock_info),
+    ("Historical Data", test_historical_data),
+    ("Price Summary", test_price_summary),
+    ("Financial Metrics", test_financial_metrics),
+]
+
+# Every test in the suite, in report order
+TESTS = [
+    (f"{name} ({ticker})", partial(test, ticker))
+    for name, test in TICKER_TESTS
+    for ticker in TICKERS
+] + [("Historical Data Batch", test_historical_data_batch)]
+
+
+# Tests that read a ticker's raw info, which the script downloads up front
+_INFO_TESTS = {"test_stock_info", "test_financial_metrics"}
+
+
+def _test_name(test):
+    """Function name of a TESTS entry, looking through partial()."""
+    return getattr(test, "func", test).__name__
+
+
+def _warm_info(ticker):
+    """Download a ticker's info ahead of the tests, leaving any error for them to report."""
     try:
-        metrics = StockDataService.get_financial_metrics("AAPL")
-        if "error" in metrics:
-            print(f"✗ Error: {metrics['error']}")
-            return False
-        
-        print(f"✓ Successfully fetched financial metrics")
-        print(f"  Valuation metrics: {len([k for k, v in metrics['valuation'].items() if v is not None])} available")
-        print(f"  Profitability metrics: {len([k for k, v in metrics['profitability'].items() if v is not None])} available")
-        print(f"  Growth metrics: {len([k for k, v in metrics['growth'].items() if v is not None])} available")
-        print(f"  Financial health metrics: {len([k for k, v in metrics['financial_health'].items() if v is not None])} available")
-        
-        # Show some sample values
-        if metrics['valuation']['pe_ratio']:
-            print(f"    - P/E Ratio: {metrics['valuation']['pe_ratio']:.2f}")
-        if metrics['profitability']['profit_margins']:
-            print(f"    - Profit Margin: {metrics['profitability']['profit_margins']*100:.2f}%")
-        
-        return True
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return False
+        _cached_info(ticker)
+    except Exception:
+        pass
 
 
 if __name__ == "__main__":
-    print("\n" + "="*60)
-    print("STOCK DATA SERVICE TEST SUITE")
-    print("="*60)
+    json_lines = os.getenv("TEST_OUTPUT") == "jsonl"
+    
+    if not json_lines:
+        print("\n" + _SEP)
+        print("STOCK DATA SERVICE TEST SUITE")
+        print(_SEP)
     
-    results = []
+    # Optionally run only the tests named on the command line
+    selected = set(sys.argv[1:])
+    tests = [(name, test) for name, test in TESTS if not selected or _test_name(test) in selected]
     
-    # Run all tests
-    results.append(("Stock Info", test_stock_info()))
-    results.append(("Historical Data", test_historical_data()))
-    results.append(("Price Summary", test_price_summary()))
-    results.append(("Financial Metrics", test_financial_metrics()))
+    # Download each ticker's info once up front, before the parallel tests both
+    # ask for it. This also sets up yfinance's session (cookie and crumb), so
+    # the timing below covers the tests only.
+    if any(_test_name(test) in _INFO_TESTS for _, test in tests):
+        with ThreadPoolExecutor(max_workers=len(TICKERS)) as executor:
+            list(executor.map(_warm_info, TICKERS))
+
+    started = time.perf_counter()
+
+    # Run tests concurrently (they are independent; output is still printed test by test)
+    results = run_tests_parallel(tests, max_workers=8, json_lines=json_lines)
+    elapsed = time.perf_counter() - started
+    
+    if json_lines:
+        sys.exit(0 if all(result for _, result in results) else 1)
     
     # Summary
-    print("\n" + "="*60)
+    print("\n" + _SEP)
     print("TEST SUMMARY")
-    print("="*60)
+    print(_SEP)
     
     passed = sum(1 for _, result in results if result)
     total = len(results)
@@ -120,10 +267,9 @@ if __name__ == "__main__":
         status = "✓ PASS" if result else "✗ FAIL"
         print(f"{status}: {test_name}")
     
-    print(f"\nTotal: {passed}/{total} tests passed")
+    print(f"\nTotal: {passed}/{total} tests passed in {elapsed:.2f}s")
     
     if passed == total:
         print("\n🎉 All tests passed! The stock_data service is working correctly.")
     else:
         print(f"\n  {total - passed} test(s) failed. Please check the errors above.")
-
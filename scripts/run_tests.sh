@@ -2,7 +2,7 @@
 # Test runner script for Finance AI Agent
 
 # Set the project root directory
-PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 export PYTHONPATH="$PROJECT_ROOT"
 
 # Activate virtual environment if it exists
@@ -26,9 +26,21 @@ case "$TEST_TYPE" in
         echo "Running AI agent tests..."
         python backend/tests/test_ai_agent.py
         ;;
+    ratelimit)
+        echo "Running rate limiter tests (offline)..."
+        python backend/tests/test_rate_limit.py
+        ;;
+    pytest)
+        echo "Running stock service tests with pytest..."
+        python -m pytest -q backend/tests/test_stock_service.py
+        ;;
     all)
         echo "Running all tests..."
         echo ""
+        python backend/tests/test_rate_limit.py
+        echo ""
+        echo "================================"
+        echo ""
         python backend/tests/test_stock_service.py
         echo ""
         echo "================================"
@@ -40,10 +52,12 @@ case "$TEST_TYPE" in
         python backend/tests/test_ai_agent.py
         ;;
     *)
-        echo "Usage: ./run_tests.sh [stock|news|ai|all]"
+        echo "Usage: ./run_tests.sh [stock|news|ai|ratelimit|pytest|all]"
         echo "  stock - Run stock service tests only"
         echo "  news  - Run news service tests only"
         echo "  ai    - Run AI agent tests only"
+        echo "  ratelimit - Run rate limiter tests only (offline)"
+        echo "  pytest - Run stock service tests under pytest"
         echo "  all   - Run all tests (default)"
         exit 1
         ;;